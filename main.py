@@ -755,7 +755,7 @@ class VideoReelCreator:
             
             # Step 1: Content Planning
             print("\n📋 STEP 1: Analyzing content and creating storyboard...")
-            content_planner = agents.content_planning_agent()
+            content_planner = agents.get('content_planning')
             planning_task = tasks.content_planning_task(
                 content_planner, 
                 self.user_prompt, 
@@ -878,7 +878,7 @@ class VideoReelCreator:
             
             # Step 2: Claude Prompt Refinement
             print("\n📝 STEP 2: Enhancing prompts with Claude AI...")
-            claude_refiner = agents.claude_refinement_agent()
+            claude_refiner = agents.get('claude_refinement')
             
             # Create context for refinement
             refinement_context = {
@@ -996,7 +996,7 @@ class VideoReelCreator:
             
             # Step 3: Video Generation using FAL.AI
             print("\n📹 STEP 3: Generating video clips with FAL.AI...")
-            video_generator = agents.video_generation_agent(reel_folder)
+            video_generator = agents.get('video_generation', reel_folder)
             
             # Create video generation context
             video_context = {
@@ -1129,7 +1129,7 @@ class VideoReelCreator:
             
             # Step 4: Audio Generation using FAL AI F5 TTS
             print("\n🎵 STEP 4: Generating audio with FAL AI F5 TTS...")
-            audio_generator = agents.audio_generation_agent()
+            audio_generator = agents.get('audio_generation')
             
             # Create audio generation context
             audio_context = {
@@ -1236,7 +1236,7 @@ class VideoReelCreator:
             
             # Step 5: Video-Audio Synchronization using MoviePy
             print("\n⚡ STEP 5: Synchronizing video and audio with MoviePy...")
-            sync_agent = agents.synchronization_agent()
+            sync_agent = agents.get('synchronization')
             
             # Create synchronization context
             sync_context = {
@@ -1365,7 +1365,7 @@ class VideoReelCreator:
             
             # Step 6: Quality Assessment with Intelligent Reloop
             print("\n🔍 STEP 6: Comprehensive quality assessment...")
-            qa_agent = agents.qa_testing_agent()
+            qa_agent = agents.get('qa')
             
             # Create QA context
             qa_context = {
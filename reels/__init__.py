@@ -3,7 +3,21 @@ Reels Package - Video Reel Generation System
 Professional video reel creation with AI generation, audio, and QA
 """
 
-from .agents import ReelAgents
-from .tasks import ReelTasks
+from typing import TYPE_CHECKING
 
-__all__ = ['ReelAgents', 'ReelTasks']
\ No newline at end of file
+if TYPE_CHECKING:
+    from .agents import ReelAgents
+    from .tasks import ReelTasks
+
+__all__ = ['ReelAgents', 'ReelTasks']
+
+
+def __getattr__(name):
+    """Import the CrewAI-backed classes on first access so submodules load without crewai"""
+    if name == 'ReelAgents':
+        from .agents import ReelAgents
+        return ReelAgents
+    if name == 'ReelTasks':
+        from .tasks import ReelTasks
+        return ReelTasks
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
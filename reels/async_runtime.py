@@ -0,0 +1,154 @@
+"""
+Shared asyncio runtime for reel generation tools
+Keeps one background event loop and one pooled httpx.AsyncClient alive for the whole process
+"""
+
+import asyncio
+import atexit
+import concurrent.futures
+import threading
+import time
+from typing import Any, Awaitable, Optional
+
+import httpx
+
+try:
+    import h2  # noqa: F401  (enables HTTP/2 in httpx)
+    HTTP2_AVAILABLE = True
+except ImportError:
+    HTTP2_AVAILABLE = False
+
+try:
+    import uvloop
+except ImportError:
+    uvloop = None
+
+
+_lock = threading.Lock()
+_loop: Optional[asyncio.AbstractEventLoop] = None
+_loop_thread: Optional[threading.Thread] = None
+_async_client: Optional[httpx.AsyncClient] = None
+_http_client: Optional[httpx.Client] = None
+
+
+def get_event_loop() -> asyncio.AbstractEventLoop:
+    """Return the shared background event loop, starting it on first use"""
+    global _loop, _loop_thread
+
+    with _lock:
+        if _loop is None or _loop.is_closed():
+            # uvloop (libuv) when installed; it services the FAL polling and batch downloads faster
+            _loop = uvloop.new_event_loop() if uvloop is not None else asyncio.new_event_loop()
+            _loop_thread = threading.Thread(
+                target=_loop.run_forever,
+                name='reels-async-runtime',
+                daemon=True
+            )
+            _loop_thread.start()
+
+    return _loop
+
+
+def run_coroutine(coro: Awaitable, timeout: Optional[float] = None) -> Any:
+    """Run a coroutine on the shared loop and block the calling thread until it finishes
+
+    Safe to call from a thread that already runs its own loop (a notebook, another
+    coroutine), since the work happens on the shared loop instead. Calling it from the
+    shared loop itself would deadlock, so that raises instead; await the coroutine there.
+    On timeout the coroutine is cancelled so it does not keep running on the loop.
+    """
+    loop = get_event_loop()
+    if threading.current_thread() is _loop_thread:
+        if asyncio.iscoroutine(coro):
+            coro.close()  # Never awaited; close it so no warning is raised at GC
+        raise RuntimeError("run_coroutine() called from the shared async runtime loop; await the coroutine instead")
+
+    future = asyncio.run_coroutine_threadsafe(coro, loop)
+    try:
+        return future.result(timeout)
+    except concurrent.futures.TimeoutError:
+        future.cancel()
+        raise
+
+
+class AsyncTokenBucket:
+    """Pace requests to rate_per_sec on average, allowing bursts of up to capacity
+
+    Waiters are served in arrival order. Only use an instance from coroutines on the shared loop.
+    """
+
+    def __init__(self, rate_per_sec: float, capacity: float):
+        self.rate_per_sec = rate_per_sec
+        self.capacity = capacity
+        self._tokens = capacity
+        self._updated = time.monotonic()
+        self._lock: Optional[asyncio.Lock] = None
+
+    async def acquire(self, cost: float = 1.0):
+        """Wait until cost tokens are available, then take them"""
+        if self._lock is None:
+            self._lock = asyncio.Lock()
+        cost = min(cost, self.capacity)
+
+        async with self._lock:
+            while True:
+                now = time.monotonic()
+                self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate_per_sec)
+                self._updated = now
+                if self._tokens >= cost:
+                    self._tokens -= cost
+                    return
+                await asyncio.sleep((cost - self._tokens) / self.rate_per_sec)
+
+
+def get_async_client() -> httpx.AsyncClient:
+    """Return the shared pooled AsyncClient (only use it from coroutines running on the shared loop)"""
+    global _async_client
+
+    if _async_client is None or _async_client.is_closed:
+        _async_client = httpx.AsyncClient(
+            http2=HTTP2_AVAILABLE,
+            timeout=httpx.Timeout(60.0),
+            limits=httpx.Limits(max_connections=100, max_keepalive_connections=20)
+        )
+
+    return _async_client
+
+
+def get_http_client() -> httpx.Client:
+    """Return the shared pooled sync Client so back-to-back FAL downloads reuse connections"""
+    global _http_client
+
+    with _lock:
+        if _http_client is None or _http_client.is_closed:
+            _http_client = httpx.Client(
+                http2=HTTP2_AVAILABLE,
+                timeout=httpx.Timeout(60.0),
+                limits=httpx.Limits(max_connections=128, max_keepalive_connections=64),
+                follow_redirects=True
+            )
+
+    return _http_client
+
+
+def _shutdown_runtime():
+    """Close the shared clients and stop the background loop at interpreter exit"""
+    if _http_client is not None and not _http_client.is_closed:
+        _http_client.close()
+
+    if _loop is None or _loop.is_closed():
+        return
+
+    try:
+        if _async_client is not None and not _async_client.is_closed:
+            asyncio.run_coroutine_threadsafe(_async_client.aclose(), _loop).result(5)
+    except Exception:
+        pass  # Ignore cleanup errors at exit
+
+    _loop.call_soon_threadsafe(_loop.stop)
+    if _loop_thread is not None:
+        _loop_thread.join(5)
+    _loop.close()
+
+
+atexit.register(_shutdown_runtime)
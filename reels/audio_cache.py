@@ -0,0 +1,241 @@
+"""
+Content-addressed cache for generated audio so repeated reel scripts skip FAL.AI
+"""
+
+import hashlib
+import json
+import os
+import shutil
+import threading
+import time
+from typing import Dict, List, Optional
+
+from .logging_config import get_logger
+from .utils import env_setting
+
+try:
+    import fcntl
+except ImportError:
+    fcntl = None  # Windows: per-key locks only coordinate threads of this process
+
+logger = get_logger(__name__, 'AUDIO_LOG_LEVEL')
+
+
+AUDIO_CACHE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), '.audio_cache')
+
+# Entries expire this long after creation; past the size cap the least recently used go first
+AUDIO_CACHE_TTL = env_setting('AUDIO_CACHE_TTL', default=30 * 24 * 3600.0, cast=float)
+AUDIO_CACHE_MAX_ENTRIES = env_setting('AUDIO_CACHE_MAX_ENTRIES', default=500, cast=int)
+
+# How long a worker waits for another one generating the same entry (a TTS job plus its download)
+AUDIO_CACHE_LOCK_TIMEOUT = env_setting('AUDIO_CACHE_LOCK_TIMEOUT', default=300.0, cast=float)
+_LOCK_POLL_INTERVAL = 0.1
+
+
+def tts_cache_key(tts_params: Dict, endpoint: str = '') -> str:
+    """Build the cache key for a TTS job from the endpoint and the exact arguments sent to FAL"""
+    payload = {'endpoint': endpoint, **tts_params}
+    # 128-bit BLAKE2b: faster than SHA-256 in pure software, still collision-safe for a shared cache
+    return hashlib.blake2b(json.dumps(payload, sort_keys=True).encode('utf-8'), digest_size=16).hexdigest()
+
+
+def _link_or_copy(source_path: str, target_path: str):
+    """Hardlink when source and target share a filesystem, otherwise copy
+
+    The link is made under a temporary name and renamed over the target, so an
+    existing target is replaced instead of being written through (which would
+    modify a cached file that shares its inode).
+    """
+    if os.path.exists(target_path) and os.path.samefile(source_path, target_path):
+        return  # Already linked
+
+    tmp_path = f"{target_path}.{os.getpid()}.{threading.get_ident()}.tmp"
+    try:
+        os.link(source_path, tmp_path)
+    except OSError:
+        shutil.copyfile(source_path, tmp_path)
+    os.replace(tmp_path, target_path)
+
+
+class _KeyLock:
+    """Exclusive lock on one cache key, held while a single worker generates the entry
+
+    flock on <key>.lock coordinates every process sharing the cache directory
+    (and threads, since each holder opens its own file description). Lock files
+    are never deleted: a waiter holding the old inode would no longer exclude a
+    newcomer that creates a fresh one. Use it as a context manager.
+    """
+
+    _thread_locks: Dict[str, threading.Lock] = {}
+    _registry_lock = threading.Lock()
+
+    def __init__(self, lock_path: str, timeout: float = AUDIO_CACHE_LOCK_TIMEOUT):
+        if fcntl is not None:
+            self._file = open(lock_path, 'a+b')
+            deadline = time.monotonic() + timeout
+            while True:
+                try:
+                    fcntl.flock(self._file.fileno(), fcntl.LOCK_EX | fcntl.LOCK_NB)
+                    break
+                except BlockingIOError:
+                    if time.monotonic() >= deadline:
+                        self._file.close()
+                        raise TimeoutError(f"Audio cache lock {lock_path} still held after {timeout:.0f}s")
+                    time.sleep(_LOCK_POLL_INTERVAL)
+        else:
+            with self._registry_lock:
+                self._file = self._thread_locks.setdefault(lock_path, threading.Lock())
+            if not self._file.acquire(timeout=timeout):
+                raise TimeoutError(f"Audio cache lock {lock_path} still held after {timeout:.0f}s")
+
+    def __enter__(self) -> '_KeyLock':
+        return self
+
+    def __exit__(self, *exc_info):
+        self.release()
+
+    def release(self):
+        """Release the lock (safe to call more than once)"""
+        lock, self._file = self._file, None
+        if lock is None:
+            return
+        if fcntl is not None:
+            fcntl.flock(lock.fileno(), fcntl.LOCK_UN)
+            lock.close()
+        else:
+            lock.release()
+
+
+class AudioCache:
+    """On-disk audio cache: one <key>.wav per entry plus a JSON manifest describing it
+
+    A file's mtime records when it was generated (for the TTL) and its atime is
+    bumped on every hit (for LRU eviction), so lookups never read the manifest.
+    """
+
+    _manifest_lock = threading.Lock()
+
+    def __init__(self, cache_dir: str = AUDIO_CACHE_DIR, ttl: float = AUDIO_CACHE_TTL,
+                 max_entries: int = AUDIO_CACHE_MAX_ENTRIES):
+        self.cache_dir = cache_dir
+        self.manifest_path = os.path.join(cache_dir, 'manifest.json')
+        self.ttl = ttl
+        self.max_entries = max_entries
+
+    def lookup(self, key: str) -> Optional[str]:
+        """Return the cached file path for a key, or None on a miss or an expired entry"""
+        cached_path = os.path.join(self.cache_dir, f"{key}.wav")
+        try:
+            st = os.stat(cached_path)
+        except OSError:
+            return None
+
+        now = time.time()
+        if now - st.st_mtime > self.ttl:
+            return None
+
+        # Record the hit explicitly; noatime/relatime mounts would not do it for us
+        try:
+            os.utime(cached_path, (now, st.st_mtime))
+        except OSError:
+            pass
+        return cached_path
+
+    def lock(self, key: str, timeout: float = AUDIO_CACHE_LOCK_TIMEOUT) -> _KeyLock:
+        """Wait until this worker owns the right to generate an entry for key (TimeoutError after timeout)"""
+        os.makedirs(self.cache_dir, exist_ok=True)
+        return _KeyLock(os.path.join(self.cache_dir, f"{key}.lock"), timeout)
+
+    def restore(self, key: str, output_path: str) -> bool:
+        """Link (or copy) a cached entry into the reel's audio folder"""
+        cached_path = self.lookup(key)
+        if cached_path is None:
+            return False
+
+        try:
+            _link_or_copy(cached_path, output_path)
+            return True
+        except OSError as e:
+            logger.warning("   ⚠️  Audio cache restore failed: %s", e)
+            return False
+
+    def store(self, key: str, source_path: str, metadata: Dict) -> None:
+        """Link (or copy) a freshly generated file into the cache and record it in the manifest"""
+        try:
+            os.makedirs(self.cache_dir, exist_ok=True)
+            cached_path = os.path.join(self.cache_dir, f"{key}.wav")
+            if not os.path.exists(cached_path):
+                _link_or_copy(source_path, cached_path)
+            self._record(key, metadata)
+        except OSError as e:
+            logger.warning("   ⚠️  Audio cache store failed: %s", e)
+
+    def store_bytes(self, key: str, audio_bytes, metadata: Dict) -> None:
+        """Write downloaded audio (bytes or a memoryview) straight into the cache and record it in the manifest"""
+        try:
+            os.makedirs(self.cache_dir, exist_ok=True)
+            cached_path = os.path.join(self.cache_dir, f"{key}.wav")
+            if not os.path.exists(cached_path):
+                tmp_path = f"{cached_path}.{os.getpid()}.{threading.get_ident()}.tmp"
+                with open(tmp_path, 'wb') as f:
+                    f.write(audio_bytes)
+                os.replace(tmp_path, cached_path)
+            self._record(key, metadata)
+        except OSError as e:
+            logger.warning("   ⚠️  Audio cache store failed: %s", e)
+
+    def _record(self, key: str, metadata: Dict) -> None:
+        """Add an entry to the manifest, evicting expired and excess entries"""
+        with self._manifest_lock:
+            manifest = self._load_manifest()
+            manifest[key] = {**metadata, 'file': f"{key}.wav", 'created_at': time.time(), 'ttl': self.ttl}
+
+            for evicted_key in self._evict():
+                manifest.pop(evicted_key, None)
+
+            tmp_path = f"{self.manifest_path}.tmp"
+            with open(tmp_path, 'w') as f:
+                json.dump(manifest, f, indent=2)
+            os.replace(tmp_path, self.manifest_path)
+
+    def _evict(self) -> List[str]:
+        """Delete expired entries, then the least recently used ones beyond max_entries (caller holds the lock)"""
+        now = time.time()
+        entries = []
+        evicted = []
+
+        with os.scandir(self.cache_dir) as it:
+            for entry in it:
+                if not entry.name.endswith('.wav'):
+                    continue
+                try:
+                    st = entry.stat()
+                except OSError:
+                    continue
+                if now - st.st_mtime > self.ttl:
+                    evicted.append(entry)
+                else:
+                    entries.append((st.st_atime, entry))
+
+        if len(entries) > self.max_entries:
+            entries.sort(key=lambda item: item[0])
+            evicted.extend(entry for _, entry in entries[:len(entries) - self.max_entries])
+
+        # <key>.lock files stay: another worker may be holding or waiting on one
+        for entry in evicted:
+            try:
+                os.remove(entry.path)
+            except OSError:
+                pass
+
+        if evicted:
+            logger.info("   🧹 Audio cache evicted %s entr%s", len(evicted), 'y' if len(evicted) == 1 else 'ies')
+        return [entry.name[:-len('.wav')] for entry in evicted]
+
+    def _load_manifest(self) -> Dict:
+        """Read the manifest, treating a missing or corrupt file as empty"""
+        try:
+            with open(self.manifest_path) as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return {}
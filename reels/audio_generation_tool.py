@@ -3,17 +3,79 @@ Custom CrewAI tool for audio generation using FAL.AI F5 TTS
 """
 
 from crewai.tools.base_tool import BaseTool
-from typing import Type, Dict, List, Any
-from pydantic import BaseModel, Field
-import json
+from typing import Type, Dict, Any, Optional, Union
+from pydantic import BaseModel, Field, field_validator
+import asyncio
+import logging
 import os
-from .audio_generator import AudioGenerator
+from functools import lru_cache
+from pathlib import PurePath
+from types import MappingProxyType
+from .audio_generator import AudioGenerator, AudioResult
+from .utils import fast_json_loads, fast_json_dumps
+from .logging_config import get_logger
+
+logger = get_logger(__name__, 'AUDIO_LOG_LEVEL')
+
+# Read-only defaults for context keys the generator relies on
+_CONTEXT_DEFAULTS = MappingProxyType({
+    'platform': 'instagram',
+    'duration': 20,
+    'user_prompt': 'video content'
+})
+
+
+@lru_cache(maxsize=1)
+def _latest_reel_folder(root: str, root_mtime_ns: int) -> Optional[str]:
+    """Find the most recently created reel_* folder in a single os.scandir pass
+    
+    root_mtime_ns only keys the cache: creating a reel folder changes the root's
+    mtime, so a cached answer is reused only while the directory is unchanged.
+    """
+    latest_path, latest_ctime = None, -1.0
+    with os.scandir(root) as entries:
+        for entry in entries:
+            if entry.name.startswith('reel_') and entry.is_dir(follow_symlinks=False):
+                ctime = entry.stat().st_ctime
+                if ctime > latest_ctime:
+                    latest_path, latest_ctime = entry.path, ctime
+    return latest_path
+
+
+@lru_cache(maxsize=32)
+def _cached_audio_generator(output_folder: str) -> AudioGenerator:
+    """Build one AudioGenerator per reel folder (it holds no per-call state, so threads can share it)"""
+    return AudioGenerator(output_folder)
+
+
+def _get_audio_generator(output_folder: str) -> AudioGenerator:
+    """Return the cached generator for a folder, rebuilding it if its audio folder was removed"""
+    audio_gen = _cached_audio_generator(output_folder)
+    if not os.path.isdir(audio_gen.audio_folder):
+        AudioGenerator._created_dirs.discard(audio_gen.audio_folder)
+        _cached_audio_generator.cache_clear()
+        audio_gen = _cached_audio_generator(output_folder)
+    return audio_gen
+
+
+def _resolve_output_folder(video_data: Dict[str, Any]) -> Optional[str]:
+    """Resolve the reel folder from the Phase 4 clips folder, falling back to the newest reel folder"""
+    clips_folder = video_data.get('next_phase_data', {}).get('clips_folder', '')
+    if not clips_folder:
+        try:
+            return _latest_reel_folder('reels', os.stat('reels').st_mtime_ns)
+        except FileNotFoundError:
+            return None
+    
+    # clips_folder format: /path/to/reels/reel_folder/raw_clips
+    clips_path = PurePath(clips_folder)
+    return str(clips_path.parent if clips_path.name == 'raw_clips' else clips_path)
 
 
 class AudioGenerationInput(BaseModel):
     """Input schema for audio generation tool"""
-    video_generation_result: str = Field(
-        description="JSON string containing video generation result from Phase 4"
+    video_generation_result: Union[Dict[str, Any], str] = Field(
+        description="Video generation result from Phase 4 (dict or JSON string)"
     )
     content_mode: str = Field(
         description="Content mode for audio generation ('narration' or 'music')",
@@ -23,10 +85,35 @@ class AudioGenerationInput(BaseModel):
         description="Audio theme/style (professional, casual, energetic, upbeat, cinematic)",
         default="professional"
     )
-    context: str = Field(
-        description="Context data (JSON string) with platform, duration, user_prompt info",
-        default=""
+    context: Union[Dict[str, Any], str] = Field(
+        description="Context data (dict or JSON string) with platform, duration, user_prompt info",
+        default_factory=dict
     )
+    
+    @field_validator('video_generation_result', mode='before')
+    @classmethod
+    def parse_video_generation_result(cls, value: Any) -> Any:
+        """Parse the Phase 4 JSON once at validation so _run receives a dict"""
+        if isinstance(value, (str, bytes)):
+            try:
+                return fast_json_loads(value)
+            except ValueError:
+                return value  # Left as-is; _run reports the folder detection failure
+        return value
+    
+    @field_validator('context', mode='before')
+    @classmethod
+    def parse_context(cls, value: Any) -> Dict[str, Any]:
+        """Parse the context JSON once at validation; anything unusable becomes an empty dict"""
+        if isinstance(value, dict):
+            return value
+        if isinstance(value, (str, bytes)) and value:
+            try:
+                parsed = fast_json_loads(value)
+            except ValueError:
+                return {}
+            return parsed if isinstance(parsed, dict) else {}
+        return {}
 
 
 class AudioGenerationTool(BaseTool):
@@ -38,131 +125,171 @@ class AudioGenerationTool(BaseTool):
     )
     args_schema: Type[BaseModel] = AudioGenerationInput
 
-    def _run(self, video_generation_result: str, content_mode: str = "music", audio_theme: str = "professional", context: str = "") -> str:
+    def _run(self, video_generation_result: Union[Dict[str, Any], str], content_mode: str = "music", audio_theme: str = "professional", context: Union[Dict[str, Any], str] = "") -> str:
         """Execute audio generation using FAL.AI F5 TTS and music generation"""
         try:
-            # Parse context
-            try:
-                context_dict = json.loads(context) if isinstance(context, str) and context else {}
-            except json.JSONDecodeError:
-                context_dict = {}
-            
-            # Set audio theme in context
-            context_dict['audio_theme'] = audio_theme
-            context_dict.setdefault('platform', 'instagram')
-            context_dict.setdefault('duration', 20)
-            context_dict.setdefault('user_prompt', 'video content')
-            
-            # Auto-determine output folder from video generation result
-            try:
-                video_data = json.loads(video_generation_result) if isinstance(video_generation_result, str) else video_generation_result
-                clips_folder = video_data.get('next_phase_data', {}).get('clips_folder', '')
-                
-                if clips_folder:
-                    # Extract parent folder from clips_folder path
-                    # clips_folder format: /path/to/reels/reel_folder/raw_clips
-                    output_folder = os.path.dirname(clips_folder) if clips_folder.endswith('/raw_clips') else clips_folder
-                else:
-                    # Try to find current reel folder
-                    reel_folders = [d for d in os.listdir('reels') if d.startswith('reel_') and os.path.isdir(os.path.join('reels', d))]
-                    if reel_folders:
-                        # Get the most recent reel folder
-                        latest_folder = max(reel_folders, key=lambda x: os.path.getctime(os.path.join('reels', x)))
-                        output_folder = os.path.join('reels', latest_folder)
-                    else:
-                        return json.dumps({
-                            'audio_generation_status': 'failed',
-                            'error': 'No output folder found and could not auto-detect reel folder'
-                        })
-            except Exception as folder_error:
-                print(f"⚠️  Output folder detection error: {folder_error}")
-                return json.dumps({
-                    'audio_generation_status': 'failed',
-                    'error': f'Output folder detection failed: {str(folder_error)}'
-                })
-            
-            print(f"\n🎵 PHASE 5: Audio Generation Tool Starting")
-            print(f"   🎚️  Content mode: {content_mode}")
-            print(f"   🎨 Audio theme: {audio_theme}")
-            print(f"   📁 Output folder: {output_folder}")
+            video_data, context_dict, output_folder, error_response = self._prepare_generation(
+                video_generation_result, content_mode, audio_theme, context
+            )
+            if error_response:
+                return error_response
             
-            # Initialize audio generator
-            audio_gen = AudioGenerator(output_folder)
+            # Reuse the audio generator for this reel folder
+            audio_gen = _get_audio_generator(output_folder)
             
             # Execute audio generation
             try:
                 result = audio_gen.generate_audio_content(
-                    video_generation_result=video_data if 'video_data' in locals() else video_generation_result,
+                    video_generation_result=video_data,
                     content_mode=content_mode,
                     context=context_dict
                 )
-                
-                # Force tool completion to prevent CrewAI hanging
-                if not result:
-                    raise Exception("No audio generated - forcing tool completion")
-                    
+
             except Exception as gen_error:
-                print(f"   ❌ Audio generation error: {gen_error}")
-                # Create fallback result to prevent CrewAI hanging
-                result = {
-                    'audio_generation_status': 'failed',
-                    'content_mode': content_mode,
-                    'generated_audio': {
-                        'file_path': None,
-                        'filename': None,
-                        'duration': context_dict.get('duration', 20),
-                        'type': content_mode,
-                        'status': 'failed',
-                        'error': str(gen_error)
-                    },
-                    'generation_summary': {
-                        'audio_type': content_mode,
-                        'duration': context_dict.get('duration', 20),
-                        'theme': audio_theme,
-                        'cost': 0.0,
-                        'status': 'failed',
-                        'error': str(gen_error)
-                    },
-                    'quality_assessment': {
-                        'audio_quality_score': 0.0,
-                        'sync_ready': False,
-                        'format_compliance': False,
-                        'ready_for_synchronization': False,
-                        'validation_notes': f'Generation failed: {str(gen_error)}'
-                    },
-                    'next_phase_data': {
-                        'audio_folder': os.path.join(output_folder, 'audio'),
-                        'final_audio_file': '',
-                        'audio_duration': context_dict.get('duration', 20),
-                        'video_clips': 0,
-                        'ready_for_phase_6': False
-                    },
-                    'error': str(gen_error)
-                }
+                result = self._create_failed_result(gen_error, content_mode, audio_theme, context_dict, output_folder)
             
-            # Print comprehensive summary
-            audio_status = result.get('audio_generation_status', 'unknown')
-            generated_audio = result.get('generated_audio', {})
-            quality_assessment = result.get('quality_assessment', {})
+            return self._finalize_result(result, content_mode)
             
-            print(f"\n🎯 AUDIO GENERATION TOOL COMPLETE!")
-            print(f"   ✅ Status: {audio_status}")
-            print(f"   🎧 Audio type: {content_mode}")
-            print(f"   📊 Quality score: {quality_assessment.get('audio_quality_score', 0.0):.2f}")
-            print(f"   💰 Cost: ${result.get('generation_summary', {}).get('cost', 0.0):.3f}")
-            print(f"   🚀 Ready for Phase 6: {quality_assessment.get('ready_for_synchronization', False)}")
+        except Exception as e:
+            return self._create_tool_error(e)
+    
+    async def _arun(self, video_generation_result: Union[Dict[str, Any], str], content_mode: str = "music", audio_theme: str = "professional", context: Union[Dict[str, Any], str] = "") -> str:
+        """Async audio generation so crews kicked off concurrently (kickoff_async / kickoff_for_each_async) overlap their FAL calls"""
+        try:
+            # Folder detection may scan the reels directory and a new generator creates its audio
+            # folder; run both off the event loop so concurrently running reels keep progressing
+            video_data, context_dict, output_folder, error_response = await asyncio.to_thread(
+                self._prepare_generation, video_generation_result, content_mode, audio_theme, context
+            )
+            if error_response:
+                return error_response
             
-            # Add script content to output if narration mode
-            if content_mode == 'narration' and 'script_content' in result:
-                print(f"   📝 Script: {result['script_content'][:100]}..." if len(result.get('script_content', '')) > 100 else f"   📝 Script: {result.get('script_content', '')}")
+            audio_gen = await asyncio.to_thread(_get_audio_generator, output_folder)
             
-            return json.dumps(result, indent=2)
+            try:
+                result = await audio_gen.generate_audio_content_async(
+                    video_generation_result=video_data,
+                    content_mode=content_mode,
+                    context=context_dict
+                )
+
+            except Exception as gen_error:
+                result = self._create_failed_result(gen_error, content_mode, audio_theme, context_dict, output_folder)
+            
+            return self._finalize_result(result, content_mode)
             
         except Exception as e:
-            error_result = {
+            return self._create_tool_error(e)
+    
+    def _prepare_generation(self, video_generation_result: Union[Dict[str, Any], str], content_mode: str, audio_theme: str, context: Union[Dict[str, Any], str]) -> tuple:
+        """Parse tool inputs and resolve the reel output folder
+        
+        Returns (video_data, context_dict, output_folder, error_response); error_response
+        is a JSON string when the output folder could not be determined.
+        """
+        # Context arrives parsed from the schema validator; direct _run calls may still pass a string.
+        # Defaults, caller context and the audio theme are merged in a single dict build.
+        context_dict = {**_CONTEXT_DEFAULTS, **AudioGenerationInput.parse_context(context), 'audio_theme': audio_theme}
+        
+        # Auto-determine output folder from video generation result
+        try:
+            video_data = fast_json_loads(video_generation_result) if isinstance(video_generation_result, str) else video_generation_result
+            output_folder = _resolve_output_folder(video_data)
+            if not output_folder:
+                return None, context_dict, None, fast_json_dumps({
+                    'audio_generation_status': 'failed',
+                    'error': 'No output folder found and could not auto-detect reel folder'
+                })
+        except Exception as folder_error:
+            logger.warning("⚠️  Output folder detection error: %s", folder_error)
+            return None, context_dict, None, fast_json_dumps({
                 'audio_generation_status': 'failed',
-                'error': str(e),
-                'message': f'Audio generation failed: {str(e)}'
-            }
-            print(f"❌ Audio generation tool error: {str(e)}")
-            return json.dumps(error_result, indent=2)
\ No newline at end of file
+                'error': f'Output folder detection failed: {str(folder_error)}'
+            })
+        
+        logger.info(
+            "\n🎵 PHASE 5: Audio Generation Tool Starting\n"
+            "   🎚️  Content mode: %s\n"
+            "   🎨 Audio theme: %s\n"
+            "   📁 Output folder: %s",
+            content_mode, audio_theme, output_folder
+        )
+        
+        return video_data, context_dict, output_folder, None
+    
+    def _create_failed_result(self, gen_error: Exception, content_mode: str, audio_theme: str, context_dict: Dict, output_folder: str) -> Dict:
+        """Create fallback result to prevent CrewAI hanging"""
+        logger.error("   ❌ Audio generation error: %s", gen_error)
+        return AudioResult(
+            audio_generation_status='failed',
+            content_mode=content_mode,
+            generated_audio={
+                'file_path': None,
+                'filename': None,
+                'duration': context_dict.get('duration', 20),
+                'type': content_mode,
+                'status': 'failed',
+                'error': str(gen_error)
+            },
+            generation_summary={
+                'audio_type': content_mode,
+                'duration': context_dict.get('duration', 20),
+                'theme': audio_theme,
+                'cost': 0.0,
+                'status': 'failed',
+                'error': str(gen_error)
+            },
+            quality_assessment={
+                'audio_quality_score': 0.0,
+                'sync_ready': False,
+                'format_compliance': False,
+                'ready_for_synchronization': False,
+                'validation_notes': f'Generation failed: {str(gen_error)}'
+            },
+            next_phase_data={
+                'audio_folder': os.path.join(output_folder, 'audio'),
+                'final_audio_file': '',
+                'audio_duration': context_dict.get('duration', 20),
+                'video_clips': 0,
+                'ready_for_phase_6': False
+            },
+            error=str(gen_error)
+        ).to_dict()
+    
+    def _finalize_result(self, result: Dict, content_mode: str) -> str:
+        """Print comprehensive summary and serialize the tool result"""
+        if logger.isEnabledFor(logging.INFO):
+            self._log_summary(result, content_mode)
+        
+        return fast_json_dumps(result)
+    
+    def _log_summary(self, result: Dict, content_mode: str):
+        """Log the completion summary as a single record"""
+        quality_assessment = result.get('quality_assessment', {})
+        
+        summary_lines = [
+            "\n🎯 AUDIO GENERATION TOOL COMPLETE!",
+            f"   ✅ Status: {result.get('audio_generation_status', 'unknown')}",
+            f"   🎧 Audio type: {content_mode}",
+            f"   📊 Quality score: {quality_assessment.get('audio_quality_score', 0.0):.2f}",
+            f"   💰 Cost: ${result.get('generation_summary', {}).get('cost', 0.0):.3f}",
+            f"   🚀 Ready for Phase 6: {quality_assessment.get('ready_for_synchronization', False)}"
+        ]
+        
+        # Add script content to output if narration mode
+        if content_mode == 'narration' and result.get('script_content') is not None:
+            script_content = result['script_content']
+            summary_lines.append(f"   📝 Script: {script_content[:100]}..." if len(script_content) > 100 else f"   📝 Script: {script_content}")
+        
+        # One log record for the whole summary instead of a write per line
+        logger.info("\n".join(summary_lines))
+    
+    def _create_tool_error(self, e: Exception) -> str:
+        """Serialize an unexpected tool failure"""
+        error_result = {
+            'audio_generation_status': 'failed',
+            'error': str(e),
+            'message': f'Audio generation failed: {str(e)}'
+        }
+        logger.error("❌ Audio generation tool error: %s", e)
+        return fast_json_dumps(error_result)
@@ -2,72 +2,395 @@
 FAL.AI F5 TTS integration with professional audio generation and processing
 """
 
+import io
 import os
-import requests
+import re
+import shutil
+import multiprocessing
+import asyncio
 import time
-import json
-from typing import List, Dict, Any, Optional, Union
-import fal_client
-from decouple import config
-try:
-    from pydub import AudioSegment
-except ImportError:
-    AudioSegment = None
-    print("⚠️  pydub not installed. Audio optimization will be limited.")
+import struct
+import concurrent.futures
+import contextlib
+from dataclasses import dataclass
+from functools import lru_cache
+from types import MappingProxyType
+from typing import List, Dict, Any, Optional, Set, Tuple, Union
+import httpx
+from .utils import env_setting, fast_json_loads
+from .audio_cache import AudioCache, tts_cache_key
+from .tts_batcher import TTSBatcher
+from .async_runtime import get_async_client, get_http_client, run_coroutine
+from .logging_config import get_logger
 
-# Ensure environment variables are loaded
-from dotenv import load_dotenv
-load_dotenv()
+logger = get_logger(__name__, 'AUDIO_LOG_LEVEL')
 
 
+@lru_cache(maxsize=None)
+def _pydub():
+    """Import pydub's AudioSegment on first use (None if pydub is not installed)"""
+    try:
+        from pydub import AudioSegment
+    except ImportError:
+        logger.warning("⚠️  pydub not installed. Audio optimization will be limited.")
+        return None
+    return AudioSegment
+
+
+@lru_cache(maxsize=None)
+def _soundfile():
+    """Import numpy and soundfile on first use ((None, None) if either is missing)"""
+    try:
+        import numpy as np
+        import soundfile as sf
+    except ImportError:
+        return None, None  # a single ffmpeg pass (or pydub) is used instead
+    return np, sf
+
+
+@lru_cache(maxsize=None)
+def _ffmpeg():
+    """Locate the ffmpeg binary once (None if it is not on PATH)"""
+    return shutil.which('ffmpeg')
+
+
+@lru_cache(maxsize=None)
+def _audio_process_pool() -> Optional[concurrent.futures.ProcessPoolExecutor]:
+    """Process pool for CPU-bound post-processing, shared by every reel (None unless AUDIO_PROCESS_WORKERS > 0)
+
+    0 keeps the work in the calling thread; NumPy and libsndfile release the GIL for most of it.
+    """
+    workers = env_setting('AUDIO_PROCESS_WORKERS', default=0, cast=int)
+    if workers <= 0:
+        return None
+    # Never fork: the shared async runtime and logging threads are already running
+    methods = multiprocessing.get_all_start_methods()
+    context = multiprocessing.get_context('forkserver' if 'forkserver' in methods else 'spawn')
+    return concurrent.futures.ProcessPoolExecutor(max_workers=workers, mp_context=context)
+
+
+def _optimize_with_soundfile(source, optimized_path: str, target_duration: float):
+    """Normalize, fit to duration and convert to 44.1kHz mono with vectorized NumPy (no ffmpeg)"""
+    np, sf = _soundfile()
+    data, sample_rate = sf.read(source, dtype='float32', always_2d=True)
+    
+    # Mono (a view for mono input, one reduction otherwise)
+    data = data[:, 0] if data.shape[1] == 1 else data.mean(axis=1)
+    
+    if sample_rate != 44100 and len(data):
+        # Linear resample onto the 44.1kHz grid
+        target_len = int(round(len(data) * 44100 / sample_rate))
+        data = np.interp(
+            np.arange(target_len) * (sample_rate / 44100),
+            np.arange(len(data)),
+            data
+        ).astype(np.float32)
+    
+    # Normalize, trim and pad in one pass: the zeroed output buffer is the
+    # silence padding, and the gain is applied while copying the kept samples
+    peak = float(np.max(np.abs(data))) if len(data) else 0.0
+    target_samples = int(target_duration * 44100)
+    kept = min(len(data), target_samples)
+    
+    output = np.zeros(target_samples, dtype=np.float32)
+    np.multiply(data[:kept], 0.98 / peak if peak > 0 else 1.0, out=output[:kept])
+    
+    sf.write(optimized_path, output, 44100, subtype='PCM_16')
+
+
+@lru_cache(maxsize=4)
+def _fal_async_client(fal_key: str):
+    """One fal_client.AsyncClient per key, so every TTS job shares its pooled connection to FAL
+
+    Jobs only ever run on the shared async runtime loop, which the client's
+    internal locks and httpx pool are bound to.
+    """
+    import fal_client  # Deferred: only real TTS runs need it
+    return fal_client.AsyncClient(key=fal_key or None, default_timeout=float(_TTS_MAX_WAIT))
+
+
+@lru_cache(maxsize=None)
+def _load_env_once():
+    """Load .env on first AudioGenerator construction only (set FAL_AUTOLOAD=0 to skip)"""
+    if os.environ.get('FAL_AUTOLOAD', '1') == '0' or os.environ.get('_ENV_LOADED'):
+        return
+    
+    from dotenv import load_dotenv
+    load_dotenv()
+    os.environ['_ENV_LOADED'] = '1'  # Inherited by worker processes, which then skip the .env read
+
+
+# Queue status interval while subscribed to a TTS job (bounds the tail latency after completion)
+_TTS_STATUS_INTERVAL = 0.5
+
+# FAL AI F5 TTS pricing
+_TTS_COST_PER_1000_CHARS = 0.05
+_TTS_COST_PER_CHAR = _TTS_COST_PER_1000_CHARS / 1000
+
+# Deadline for a single TTS job, and the extra time a blocked caller allows before giving up
+_TTS_MAX_WAIT = 120  # 2 minutes for TTS
+_TTS_CALLER_GRACE = 10
+
+# Canonical 44-byte PCM WAV header: RIFF chunk, 16-byte fmt chunk, data chunk header
+_WAV_HEADER = struct.Struct('<4sI4s4sIHHIIHH4sI')
+
+# Audio downloads are copied in 1 MiB blocks
+_DOWNLOAD_CHUNK_SIZE = 1024 * 1024
+
+# Single ffmpeg pass used when soundfile is missing: loudness-normalize, then pad (trimmed by -t)
+_FFMPEG_FILTERGRAPH = 'loudnorm=I=-16:TP=-1.5:LRA=11,apad'
+_FFMPEG_TIMEOUT = 60
+
+@lru_cache(maxsize=None)
+def _tts_batcher() -> Optional[TTSBatcher]:
+    """Opt-in micro-batching of TTS requests from concurrent reels (None unless BATCH_TTS=1)"""
+    return TTSBatcher() if env_setting('BATCH_TTS', default=False, cast=bool) else None
+
+
+# Per-sentence TTS: segments are synthesized concurrently and stitched with pydub
+_TTS_SEGMENT_CONCURRENCY = 3
+_SENTENCE_SPLIT = re.compile(r'(?<=[.!?])\s+')
+
+
+@lru_cache(maxsize=None)
+def _sentence_tts() -> bool:
+    """Opt-in per-sentence TTS (SENTENCE_TTS=1)"""
+    return env_setting('SENTENCE_TTS', default=False, cast=bool)
+
+
+# Content category keywords in priority order (first matching category wins)
+_CATEGORY_KEYWORDS = (
+    ('fashion', ('fashion', 'clothing', 'style', 'outfit', 'brand', 'nike', 'adidas')),
+    ('educational', ('tutorial', 'how to', 'learn', 'guide', 'education')),
+    ('fitness', ('fitness', 'workout', 'exercise', 'gym', 'muscle')),
+    ('food', ('food', 'recipe', 'cooking', 'kitchen', 'ingredient'))
+)
+
+# One scanner for every keyword: each category is a named group inside a lookahead, so a single
+# finditer pass reports every category present (overlaps included) and priority is applied afterwards
+_CATEGORY_PATTERN = re.compile('(?=' + '|'.join(
+    f"(?P<{category}>{'|'.join(re.escape(word) for word in words)})"
+    for category, words in _CATEGORY_KEYWORDS
+) + ')')
+_CATEGORY_PRIORITY = {category: rank for rank, (category, _) in enumerate(_CATEGORY_KEYWORDS)}
+
+
+@lru_cache(maxsize=256)
+def _match_content_category(prompt_lower: str) -> str:
+    """Return the highest-priority content category whose keywords appear in the prompt"""
+    best = None
+    for match in _CATEGORY_PATTERN.finditer(prompt_lower):
+        category = match.lastgroup
+        if best is None or _CATEGORY_PRIORITY[category] < _CATEGORY_PRIORITY[best]:
+            best = category
+            if _CATEGORY_PRIORITY[best] == 0:
+                break
+    return best or 'general'
+
+
+# Opening line per content category ({p} is the lowercased user prompt)
+_CATEGORY_OPENERS = {
+    'fashion': "Discover the latest fashion trends with our exclusive collection.",
+    'educational': "Let me walk you through this step by step.",
+    'fitness': "Ready to transform your fitness routine?",
+    'food': "This recipe is about to become your new favorite.",
+    'general': "Introducing our latest {p}."
+}
+
+_SCRIPT_DETAIL = " We've carefully crafted this to give you exactly what you're looking for. The quality and attention to detail will speak for themselves."
+_SCRIPT_AUDIENCE = " Whether you're just getting started or you're already experienced, this is designed to meet your needs perfectly."
+
+# Script body by duration bucket (approximately 150 words per minute); last entry catches longer reels
+_DURATION_BODIES = (
+    (10, " Perfect for {platform}. Don't miss out!"),
+    (20, _SCRIPT_DETAIL),
+    (float('inf'), _SCRIPT_DETAIL + _SCRIPT_AUDIENCE)
+)
+
+_PLATFORM_CTAS = {
+    'tiktok': " Comment below if you want to see more!",
+    'instagram': " Save this for later and share with friends!"
+}
+_DEFAULT_CTA = " Let us know what you think in the comments!"
+
+
+@lru_cache(maxsize=1024)
+def _build_narration_script(user_prompt: str, platform: str, duration: float) -> str:
+    """Assemble the narration script from the category opener, duration body and platform CTA"""
+    opener = _CATEGORY_OPENERS[_match_content_category(user_prompt.lower())]
+    if '{p}' in opener:
+        opener = opener.format(p=user_prompt.lower())
+    
+    body = next(text for limit, text in _DURATION_BODIES if duration <= limit)
+    if '{platform}' in body:
+        body = body.format(platform=platform)
+    
+    return opener + body + _PLATFORM_CTAS.get(platform.lower(), _DEFAULT_CTA)
+
+
+
+# F5 TTS voice description per voice style ('professional' is the fallback)
+_VOICE_OPTIONS = MappingProxyType({
+    'professional': 'A professional, clear voice suitable for business content',
+    'casual': 'A friendly, approachable voice for lifestyle content',
+    'energetic': 'An enthusiastic, upbeat voice for fitness and motivational content',
+    'calm': 'A soothing, peaceful voice for wellness and meditation content'
+})
+
+# Per-mode pricing summary (read-only); get_cost_estimates hands out plain-dict copies
+_COST_ESTIMATES = MappingProxyType({
+    'narration_mode': MappingProxyType({
+        'cost_per_1000_chars': _TTS_COST_PER_1000_CHARS,
+        'typical_script_chars': 400,  # ~20 second narration
+        'estimated_cost': 0.02
+    }),
+    'music_mode': MappingProxyType({
+        'cost_per_generation': 0.0,  # Free in development phase
+        'typical_duration': 20,
+        'estimated_cost': 0.0
+    })
+})
+
+# Fixed fields of failed and mock results; builders merge in the per-call values
+_FAILED_GENERATED_AUDIO = MappingProxyType({
+    'file_path': None,
+    'filename': None,
+    'duration': 0,
+    'status': 'failed',
+    'format': 'wav',
+    'cost_estimate': 0.0
+})
+_FAILED_QUALITY = MappingProxyType({
+    'audio_quality_score': 0.0,
+    'sync_ready': False,
+    'format_compliance': False,
+    'ready_for_synchronization': False
+})
+_FAILED_NEXT_PHASE = MappingProxyType({
+    'final_audio_file': '',
+    'audio_duration': 0,
+    'video_clips': 0,
+    'ready_for_phase_6': False
+})
+_MOCK_AUDIO = MappingProxyType({'status': 'mock', 'sample_rate': 44100, 'format': 'wav'})
+
+
+@lru_cache(maxsize=16)
+def _voice_params(voice_style: str, sample_rate: int) -> MappingProxyType:
+    """Voice-dependent part of the F5 TTS arguments, shared by every request with that voice"""
+    return MappingProxyType({
+        'voice_description': _VOICE_OPTIONS.get(voice_style, _VOICE_OPTIONS['professional']),
+        'sample_rate': sample_rate
+    })
+
+
+@lru_cache(maxsize=256)
+def _calculate_speech_speed(script_len: int, target_duration: float) -> float:
+    """Speech speed that fits a script of script_len characters into target_duration seconds"""
+    estimated_duration = script_len / 150 * 60  # rough estimate (150 chars per minute)
+    speed_adjustment = estimated_duration / target_duration if target_duration > 0 else 1.0
+    return max(0.7, min(1.3, speed_adjustment))  # limit between 0.7x and 1.3x
+
+class InvalidAudioError(Exception):
+    """Raised when a downloaded file is not recognizable audio"""
+
+
+def _looks_like_audio(header: bytes) -> bool:
+    """Check the leading bytes for a RIFF/WAVE header or an MP3 (ID3 tag or frame sync)"""
+    if header[:4] == b'RIFF' and header[8:12] == b'WAVE':
+        return True
+    if header[:3] == b'ID3':
+        return True
+    return len(header) > 1 and header[0] == 0xFF and (header[1] & 0xE0) == 0xE0
+
+
+@dataclass(slots=True, frozen=True)
+class AudioResult:
+    """Phase 5 result as built internally (slotted); generate_audio_content returns its to_dict()"""
+    audio_generation_status: str
+    content_mode: str
+    generated_audio: Dict[str, Any]
+    generation_summary: Dict[str, Any]
+    quality_assessment: Dict[str, Any]
+    next_phase_data: Dict[str, Any]
+    script_content: Optional[str] = None
+    error: Optional[str] = None
+    
+    def to_dict(self) -> Dict[str, Any]:
+        """Shallow dict for JSON output; optional fields are only included when set"""
+        result = {
+            'audio_generation_status': self.audio_generation_status,
+            'content_mode': self.content_mode,
+            'generated_audio': self.generated_audio,
+            'generation_summary': self.generation_summary,
+            'quality_assessment': self.quality_assessment,
+            'next_phase_data': self.next_phase_data
+        }
+        if self.script_content is not None:
+            result['script_content'] = self.script_content
+        if self.error is not None:
+            result['error'] = self.error
+        return result
+
 class AudioGenerator:
     """Advanced FAL.AI F5 TTS integration with professional audio processing and intelligent mode selection"""
     
-    def __init__(self, output_folder: str):
+    # Audio folders already created in this process (skips a makedirs per construction)
+    _created_dirs: Set[str] = set()
+    
+    def __init__(self, output_folder: str, client: Optional[httpx.Client] = None):
         self.output_folder = output_folder
         
-        # Load FAL_KEY with multiple fallbacks
-        self.fal_key = config('FAL_KEY', default='')
-        if not self.fal_key:
-            self.fal_key = os.getenv('FAL_KEY', '')
-        if not self.fal_key:
-            self.fal_key = os.environ.get('FAL_KEY', '')
-            
-        print(f"🔑 FAL_KEY status: {'✅ Found' if self.fal_key else '❌ Missing'}")
+        _load_env_once()
+        
+        # Pooled keep-alive HTTP client for audio downloads (the process-wide one unless injected)
+        self.http_client = client if client is not None else get_http_client()
+        self.audio_cache = AudioCache()
+        
+        # .env has been loaded into os.environ, so one lookup covers every source
+        self.fal_key = os.environ.get('FAL_KEY', '')
+        
+        logger.info("🔑 FAL_KEY status: %s", '✅ Found' if self.fal_key else '❌ Missing')
         if self.fal_key:
-            print(f"🔑 FAL_KEY prefix: {self.fal_key[:8]}...")
+            logger.info("🔑 FAL_KEY prefix: %s...", self.fal_key[:8])
         
         # Validate and ensure audio folder exists
-        if not output_folder or not os.path.exists(output_folder):
+        if not output_folder:
             raise ValueError(f"Output folder does not exist or is invalid: {output_folder}")
         
         self.audio_folder = os.path.join(output_folder, 'audio')
-        try:
-            os.makedirs(self.audio_folder, exist_ok=True)
-            print(f"📁 Created audio folder: {self.audio_folder}")
-        except (PermissionError, OSError) as e:
-            raise ValueError(f"Cannot create audio folder {self.audio_folder}: {e}")
+        self._audio_folder_prefix = self.audio_folder + os.sep  # joined with f-strings on hot paths
+        if self.audio_folder not in AudioGenerator._created_dirs:
+            # A single mkdir doubles as the output folder check: it fails with
+            # FileNotFoundError when the parent is missing
+            try:
+                os.mkdir(self.audio_folder)
+                logger.info("📁 Created audio folder: %s", self.audio_folder)
+            except FileNotFoundError:
+                raise ValueError(f"Output folder does not exist or is invalid: {output_folder}")
+            except FileExistsError:
+                if not os.path.isdir(self.audio_folder):
+                    raise ValueError(f"Cannot create audio folder {self.audio_folder}: not a directory")
+            except (PermissionError, OSError) as e:
+                raise ValueError(f"Cannot create audio folder {self.audio_folder}: {e}")
+            AudioGenerator._created_dirs.add(self.audio_folder)
+        elif not os.path.isdir(output_folder):
+            raise ValueError(f"Output folder does not exist or is invalid: {output_folder}")
         
-        # Initialize FAL client
+        # Initialize FAL client (fal_client reads FAL_KEY from the environment when first used)
         if self.fal_key:
-            fal_client.api_key = self.fal_key
             os.environ['FAL_KEY'] = self.fal_key
         else:
-            print("⚠️  FAL_KEY not found. Audio generation will use mock mode.")
+            logger.warning("⚠️  FAL_KEY not found. Audio generation will use mock mode.")
         
         # FAL AI F5 TTS Configuration
         self.f5_tts_config = {
             'endpoint': 'fal-ai/f5-tts',
-            'cost_per_1000_chars': 0.05,
+            'cost_per_1000_chars': _TTS_COST_PER_1000_CHARS,
             'max_duration': 30,  # seconds
             'sample_rate': 44100,
             'supported_formats': ['wav', 'mp3'],
-            'voice_options': {
-                'professional': 'A professional, clear voice suitable for business content',
-                'casual': 'A friendly, approachable voice for lifestyle content',
-                'energetic': 'An enthusiastic, upbeat voice for fitness and motivational content',
-                'calm': 'A soothing, peaceful voice for wellness and meditation content'
-            }
+            'voice_options': _VOICE_OPTIONS
         }
         
         # Music generation configuration (placeholder for future implementation)
@@ -85,17 +408,23 @@ class AudioGenerator:
         """Generate audio content based on video generation results and content mode"""
         
         try:
-            print(f"🎵 PHASE 5: Audio Generation Starting")
-            print(f"   🎚️  Content Mode: {content_mode}")
-            print(f"   📁 Output folder: {self.audio_folder}")
+            logger.info(
+                "🎵 PHASE 5: Audio Generation Starting\n"
+                "   🎚️  Content Mode: %s\n"
+                "   📁 Output folder: %s",
+                content_mode, self.audio_folder
+            )
             
             # Extract video generation data
             video_data = self._extract_video_generation_data(video_generation_result)
             total_duration = video_data['total_duration']
             video_clips = video_data['generated_clips']
             
-            print(f"   ⏱️  Total duration: {total_duration}s")
-            print(f"   🎬 Video clips: {len(video_clips)}")
+            logger.info(
+                "   ⏱️  Total duration: %ss\n"
+                "   🎬 Video clips: %s",
+                total_duration, len(video_clips)
+            )
             
             # Generate audio based on content mode
             if content_mode == 'narration':
@@ -110,47 +439,55 @@ class AudioGenerator:
             quality_assessment = self._validate_audio_quality(processed_audio)
             
             # Build comprehensive result
-            result = {
-                'audio_generation_status': processed_audio['status'],
-                'content_mode': content_mode,
-                'generated_audio': processed_audio,
-                'generation_summary': {
+            result = AudioResult(
+                audio_generation_status=processed_audio['status'],
+                content_mode=content_mode,
+                generated_audio=processed_audio,
+                generation_summary={
                     'audio_type': content_mode,
                     'duration': total_duration,
                     'theme': context.get('audio_theme', 'professional'),
                     'cost': processed_audio.get('cost_estimate', 0.0),
                     'status': processed_audio['status']
                 },
-                'quality_assessment': quality_assessment,
-                'next_phase_data': {
+                quality_assessment=quality_assessment,
+                next_phase_data={
                     'audio_folder': self.audio_folder,
                     'final_audio_file': processed_audio.get('filename', ''),
                     'audio_duration': total_duration,
                     'video_clips': len(video_clips),
                     'ready_for_phase_6': quality_assessment.get('ready_for_synchronization', False)
-                }
-            }
-            
-            if content_mode == 'narration' and 'script_content' in audio_result:
-                result['script_content'] = audio_result['script_content']
+                },
+                script_content=audio_result.get('script_content') if content_mode == 'narration' else None
+            )
             
-            print(f"\n🎯 AUDIO GENERATION COMPLETE!")
-            print(f"   ✅ Status: {processed_audio['status']}")
-            print(f"   💰 Cost: ${processed_audio.get('cost_estimate', 0.0):.3f}")
-            print(f"   📊 Quality: {quality_assessment.get('audio_quality_score', 0.0):.2f}")
-            print(f"   🚀 Ready for Phase 6: {quality_assessment.get('ready_for_synchronization', False)}")
+            logger.info(
+                "\n🎯 AUDIO GENERATION COMPLETE!\n"
+                "   ✅ Status: %s\n"
+                "   💰 Cost: $%.3f\n"
+                "   📊 Quality: %.2f\n"
+                "   🚀 Ready for Phase 6: %s",
+                processed_audio['status'],
+                processed_audio.get('cost_estimate', 0.0),
+                quality_assessment.get('audio_quality_score', 0.0),
+                quality_assessment.get('ready_for_synchronization', False)
+            )
             
-            return result
+            return result.to_dict()
             
         except Exception as e:
-            print(f"❌ Audio generation error: {str(e)}")
-            return self._create_error_result(str(e), content_mode, context)
+            logger.error("❌ Audio generation error: %s", e)
+            return self._create_error_result(str(e), content_mode, context).to_dict()
+    
+    async def generate_audio_content_async(self, video_generation_result: Dict, content_mode: str, context: Dict) -> Dict:
+        """Async variant of generate_audio_content so several reels can generate audio concurrently"""
+        return await asyncio.to_thread(self.generate_audio_content, video_generation_result, content_mode, context)
     
     def _extract_video_generation_data(self, video_result: Union[Dict, str]) -> Dict:
         """Extract video generation data from Phase 4 results"""
         try:
             if isinstance(video_result, str):
-                video_result = json.loads(video_result)
+                video_result = fast_json_loads(video_result)
             
             generated_clips = video_result.get('generated_clips', [])
             total_duration = 0
@@ -174,7 +511,7 @@ class AudioGenerator:
             }
             
         except Exception as e:
-            print(f"⚠️  Error extracting video data: {e}")
+            logger.warning("⚠️  Error extracting video data: %s", e)
             return {
                 'generated_clips': [],
                 'total_duration': 20,  # default
@@ -190,26 +527,67 @@ class AudioGenerator:
             script_content = self._create_intelligent_script(video_data, context)
             audio_theme = context.get('audio_theme', 'professional')
             
-            print(f"   📝 Generated script ({len(script_content)} chars)")
-            print(f"   🎭 Voice style: {audio_theme}")
-            print(f"   💰 Estimated cost: ${self._calculate_tts_cost(script_content):.3f}")
+            logger.info(
+                "   📝 Generated script (%s chars)\n"
+                "   🎭 Voice style: %s",
+                len(script_content), audio_theme
+            )
             
             if not self.fal_key:
                 return self._create_mock_narration(script_content, video_data['total_duration'], audio_theme)
             
-            # Generate TTS using FAL AI F5
-            tts_result = self._execute_f5_tts_generation(script_content, audio_theme, video_data['total_duration'])
-            
-            return {
+            # Reuse previously generated audio for identical TTS jobs (endpoint, script, voice, speed, sample rate)
+            cache_key = tts_cache_key(
+                self._build_tts_params(script_content, audio_theme, video_data['total_duration']),
+                self.f5_tts_config['endpoint']
+            )
+            cache_hit = {
                 'type': 'narration',
                 'script_content': script_content,
-                'tts_result': tts_result,
+                'tts_result': {'status': 'cache_hit', 'cache_key': cache_key},
                 'voice_style': audio_theme,
-                'cost_estimate': self._calculate_tts_cost(script_content)
+                'cost_estimate': 0.0
             }
+            if self.audio_cache.lookup(cache_key):
+                logger.info("   ♻️  Audio cache hit: %s", cache_key)
+                return cache_hit
+            
+            # Single-flight: concurrent workers with the same script wait here for the
+            # first one to generate and cache the audio, then take it instead of paying again
+            try:
+                cache_lock = self.audio_cache.lock(cache_key)
+            except TimeoutError as e:
+                logger.warning("   ⚠️  %s; generating without it", e)
+                cache_lock = contextlib.nullcontext()
+            
+            with cache_lock:
+                if self.audio_cache.lookup(cache_key):
+                    logger.info("   ♻️  Audio cache hit after wait: %s", cache_key)
+                    return cache_hit
+                
+                # Only estimate cost once we know a paid FAL call will be made
+                cost_estimate = self._calculate_tts_cost(script_content)
+                logger.info("   💰 Estimated cost: $%.3f", cost_estimate)
+                
+                # Generate TTS using FAL AI F5
+                tts_result = self._execute_f5_tts_generation(script_content, audio_theme, video_data['total_duration'])
+                audio_result = {
+                    'type': 'narration',
+                    'script_content': script_content,
+                    'tts_result': tts_result,
+                    'voice_style': audio_theme,
+                    'cache_key': cache_key,
+                    'cost_estimate': cost_estimate
+                }
+                
+                # Store the raw audio before releasing the lock so waiters find it
+                if self._cache_tts_audio(audio_result):
+                    audio_result['tts_result'] = {'status': 'cache_hit', 'cache_key': cache_key, 'generated': True}
+            
+            return audio_result
             
         except Exception as e:
-            print(f"⚠️  Narration generation error: {e}")
+            logger.warning("⚠️  Narration generation error: %s", e)
             return self._create_mock_narration(
                 "Professional narration placeholder script",
                 video_data['total_duration'],
@@ -223,166 +601,187 @@ class AudioGenerator:
             audio_theme = context.get('audio_theme', 'upbeat')
             duration = video_data['total_duration']
             
-            print(f"   🎵 Generating background music")
-            print(f"   🎼 Theme: {audio_theme}")
-            print(f"   ⏱️  Duration: {duration}s")
-            print(f"   💰 Cost: Free (development phase)")
+            logger.info(
+                "   🎵 Generating background music\n"
+                "   🎼 Theme: %s\n"
+                "   ⏱️  Duration: %ss\n"
+                "   💰 Cost: Free (development phase)",
+                audio_theme, duration
+            )
             
             # For Phase 5, create high-quality mock music
             return self._create_mock_background_music(audio_theme, duration)
             
         except Exception as e:
-            print(f"⚠️  Music generation error: {e}")
+            logger.warning("⚠️  Music generation error: %s", e)
             return self._create_mock_background_music('upbeat', video_data['total_duration'])
     
     def _create_intelligent_script(self, video_data: Dict, context: Dict) -> str:
         """Create intelligent script based on user prompt and video content"""
         
-        user_prompt = context.get('user_prompt', 'video content')
-        platform = context.get('platform', 'instagram')
-        duration = video_data['total_duration']
-        
-        # Analyze content type and create appropriate script
-        content_category = self._analyze_content_category(user_prompt)
-        
-        if content_category == 'fashion':
-            script_templates = [
-                "Discover the latest fashion trends with our exclusive collection.",
-                "Style meets comfort in every piece.",
-                "Transform your wardrobe with these must-have items."
-            ]
-        elif content_category == 'educational':
-            script_templates = [
-                "Let me walk you through this step by step.",
-                "Here's what you need to know about this topic.",
-                "This technique will completely change your approach."
-            ]
-        elif content_category == 'fitness':
-            script_templates = [
-                "Ready to transform your fitness routine?",
-                "These exercises will target all the right muscles.",
-                "Consistency is key to seeing real results."
-            ]
-        elif content_category == 'food':
-            script_templates = [
-                "This recipe is about to become your new favorite.",
-                "Fresh ingredients make all the difference.",
-                "The secret ingredient that changes everything."
-            ]
-        else:  # general/promotional
-            script_templates = [
-                f"Introducing our latest {user_prompt.lower()}.",
-                f"Everything you need to know about {user_prompt.lower()}.",
-                f"This {user_prompt.lower()} will exceed your expectations."
-            ]
-        
-        # Select and adapt script based on duration
-        base_script = script_templates[0]  # Use first template
-        
-        # Adapt script length for duration (approximately 150 words per minute)
-        if duration <= 10:
-            # Short script for quick reels
-            script = f"{base_script} Perfect for {platform}. Don't miss out!"
-        elif duration <= 20:
-            # Medium script
-            script = f"{base_script} We've carefully crafted this to give you exactly what you're looking for. The quality and attention to detail will speak for themselves."
-        else:
-            # Longer script
-            script = f"{base_script} We've carefully crafted this to give you exactly what you're looking for. The quality and attention to detail will speak for themselves. Whether you're just getting started or you're already experienced, this is designed to meet your needs perfectly."
-        
-        # Add platform-specific call-to-action
-        if platform.lower() == 'tiktok':
-            script += " Comment below if you want to see more!"
-        elif platform.lower() == 'instagram':
-            script += " Save this for later and share with friends!"
-        else:
-            script += " Let us know what you think in the comments!"
-        
-        return script
+        return _build_narration_script(
+            context.get('user_prompt', 'video content'),
+            context.get('platform', 'instagram'),
+            video_data['total_duration']
+        )
     
     def _analyze_content_category(self, user_prompt: str) -> str:
         """Analyze user prompt to determine content category"""
-        prompt_lower = user_prompt.lower()
-        
-        if any(word in prompt_lower for word in ['fashion', 'clothing', 'style', 'outfit', 'brand', 'nike', 'adidas']):
-            return 'fashion'
-        elif any(word in prompt_lower for word in ['tutorial', 'how to', 'learn', 'guide', 'education']):
-            return 'educational'
-        elif any(word in prompt_lower for word in ['fitness', 'workout', 'exercise', 'gym', 'muscle']):
-            return 'fitness'
-        elif any(word in prompt_lower for word in ['food', 'recipe', 'cooking', 'kitchen', 'ingredient']):
-            return 'food'
-        else:
-            return 'general'
+        return _match_content_category(user_prompt.lower())
+    
+    def _build_tts_params(self, script: str, voice_style: str, target_duration: float) -> Dict:
+        """Prepare F5 TTS parameters with speech speed matched to the target duration"""
+        return {
+            'text': script,
+            **_voice_params(voice_style, self.f5_tts_config['sample_rate']),
+            'speed': _calculate_speech_speed(len(script), target_duration)
+        }
     
     def _execute_f5_tts_generation(self, script: str, voice_style: str, target_duration: float) -> Dict:
         """Execute FAL AI F5 TTS generation with proper error handling"""
         
         try:
-            # Prepare F5 TTS parameters
-            voice_description = self.f5_tts_config['voice_options'].get(
-                voice_style, 
-                self.f5_tts_config['voice_options']['professional']
-            )
-            
-            # Adjust speech speed to match target duration
-            estimated_duration = len(script) / 150 * 60  # rough estimate (150 chars per minute)
-            speed_adjustment = estimated_duration / target_duration if target_duration > 0 else 1.0
-            speed_adjustment = max(0.7, min(1.3, speed_adjustment))  # limit between 0.7x and 1.3x
+            tts_params = self._build_tts_params(script, voice_style, target_duration)
             
-            tts_params = {
-                'text': script,
-                'voice_description': voice_description,
-                'speed': speed_adjustment,
-                'sample_rate': self.f5_tts_config['sample_rate']
-            }
-            
-            print(f"   🎤 Calling FAL AI F5 TTS...")
-            print(f"   ⚡ Speed adjustment: {speed_adjustment:.2f}x")
-            
-            # Submit to FAL AI F5 TTS
-            result = fal_client.submit(
-                self.f5_tts_config['endpoint'],
-                arguments=tts_params
+            logger.info(
+                "   🎤 Calling FAL AI F5 TTS...\n"
+                "   ⚡ Speed adjustment: %.2fx",
+                tts_params['speed']
             )
             
-            if not result or not hasattr(result, 'request_id'):
-                raise Exception("FAL AI F5 TTS submission failed")
-            
-            print(f"   📋 Request ID: {result.request_id}")
-            
-            # Wait for result with timeout
-            max_wait_time = 120  # 2 minutes for TTS
-            start_time = time.time()
-            
-            while time.time() - start_time < max_wait_time:
+            sentences = _SENTENCE_SPLIT.split(script.strip()) if _sentence_tts() and _pydub() is not None else []
+            if len(sentences) > 1:
+                logger.info("   ✂️  Splitting narration into %s sentence segments", len(sentences))
                 try:
-                    final_result = result.get()
-                    elapsed = time.time() - start_time
-                    print(f"   ✅ TTS completed in {elapsed:.1f}s")
-                    
-                    if 'audio' in final_result and 'url' in final_result['audio']:
-                        return {
-                            'status': 'success',
-                            'audio_url': final_result['audio']['url'],
-                            'duration': final_result.get('duration', target_duration),
-                            'sample_rate': self.f5_tts_config['sample_rate'],
-                            'format': 'wav'
-                        }
-                    else:
-                        raise Exception("No audio URL in F5 TTS result")
-                        
-                except Exception as get_error:
-                    if time.time() - start_time > max_wait_time:
-                        raise Exception(f"F5 TTS timeout after {max_wait_time}s")
-                    time.sleep(5)  # wait 5 seconds before retry
+                    return run_coroutine(
+                        self._submit_f5_tts_segments_async(sentences, voice_style, target_duration),
+                        timeout=_TTS_MAX_WAIT + _TTS_CALLER_GRACE
+                    )
+                except concurrent.futures.TimeoutError:
+                    raise Exception(f"F5 TTS timeout after {_TTS_MAX_WAIT}s")
+            
+            batcher = _tts_batcher()
+            if batcher is not None:
+                start_time = time.time()
+                final_result = batcher.request(self.f5_tts_config['endpoint'], tts_params, timeout=_TTS_MAX_WAIT)
+                logger.info("   ✅ TTS completed in %.1fs", time.time() - start_time)
+                return self._build_tts_success(final_result, target_duration)
             
-            raise Exception(f"F5 TTS timeout after {max_wait_time}s")
+            # Submit and await on the shared async runtime so concurrent narrations share one event loop;
+            # the caller-side timeout guarantees this thread is released even if the loop stalls
+            try:
+                return run_coroutine(
+                    self._submit_f5_tts_async(tts_params, target_duration),
+                    timeout=_TTS_MAX_WAIT + _TTS_CALLER_GRACE
+                )
+            except concurrent.futures.TimeoutError:
+                raise Exception(f"F5 TTS timeout after {_TTS_MAX_WAIT}s")
             
         except Exception as e:
-            print(f"   ❌ F5 TTS generation failed: {str(e)}")
+            logger.error("   ❌ F5 TTS generation failed: %s", e)
             raise e
     
+    async def _submit_f5_tts_async(self, tts_params: Dict, target_duration: float) -> Dict:
+        """Run an F5 TTS job on the shared FAL client and return the parsed result"""
+        import fal_client  # Deferred: only real TTS runs need it
+        
+        start_time = time.monotonic()
+        last_state = [None]
+        
+        def on_queue_update(status):
+            """Log queue transitions (position changes, processing start) once each"""
+            if isinstance(status, fal_client.Queued):
+                state = ('queued', status.position)
+            elif isinstance(status, fal_client.InProgress):
+                state = ('in_progress', None)
+            else:
+                return
+            if state != last_state[0]:
+                last_state[0] = state
+                if state[0] == 'queued':
+                    logger.info("   ⏳ TTS queued (position %s)", status.position)
+                else:
+                    logger.info("   🔄 TTS processing...")
+        
+        try:
+            # subscribe submits, follows the queue and fetches the result in one call;
+            # wait_for stops following the job once the deadline passes
+            final_result = await asyncio.wait_for(
+                _fal_async_client(self.fal_key).subscribe(
+                    self.f5_tts_config['endpoint'],
+                    arguments=tts_params,
+                    with_logs=False,
+                    interval=_TTS_STATUS_INTERVAL,
+                    on_enqueue=lambda request_id: logger.info("   📋 Request ID: %s", request_id),
+                    on_queue_update=on_queue_update
+                ),
+                timeout=_TTS_MAX_WAIT
+            )
+        except asyncio.TimeoutError:
+            raise Exception(f"F5 TTS timeout after {_TTS_MAX_WAIT}s")
+        
+        elapsed = time.monotonic() - start_time
+        logger.info("   ✅ TTS completed in %.1fs", elapsed)
+        
+        return self._build_tts_success(final_result, target_duration)
+    
+    async def _submit_f5_tts_segments_async(self, sentences: List[str], voice_style: str, target_duration: float) -> Dict:
+        """Synthesize each sentence concurrently (bounded), downloading each segment as soon as it is ready"""
+        semaphore = asyncio.Semaphore(_TTS_SEGMENT_CONCURRENCY)
+        total_chars = sum(len(sentence) for sentence in sentences)
+        batch_id = time.time_ns()
+        segment_paths = [f"{self._audio_folder_prefix}segment_{batch_id}_{i}.wav" for i in range(len(sentences))]
+        
+        async def synthesize(sentence: str, segment_path: str) -> Dict:
+            # Each segment gets a duration share proportional to its length, keeping one speech speed
+            segment_duration = target_duration * len(sentence) / total_chars
+            async with semaphore:
+                segment = await self._submit_f5_tts_async(
+                    self._build_tts_params(sentence, voice_style, segment_duration),
+                    segment_duration
+                )
+            # Download outside the semaphore so the next sentence's TTS overlaps this transfer
+            await self._download_audio_async(segment['audio_url'], segment_path)
+            return segment
+        
+        tasks = [
+            asyncio.ensure_future(synthesize(sentence, segment_path))
+            for sentence, segment_path in zip(sentences, segment_paths)
+        ]
+        try:
+            # gather preserves submission order, so segments stitch back in script order
+            segments = await asyncio.gather(*tasks)
+        except BaseException:
+            # Stop the remaining segments before removing their files
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+            self._remove_files(segment_paths)
+            raise
+        
+        return {
+            'status': 'success',
+            'audio_url': segments[0]['audio_url'],
+            'segment_urls': [segment['audio_url'] for segment in segments],
+            'segment_paths': segment_paths,
+            'duration': target_duration,
+            'sample_rate': self.f5_tts_config['sample_rate'],
+            'format': 'wav'
+        }
+    
+    def _build_tts_success(self, final_result: Dict, target_duration: float) -> Dict:
+        """Convert a completed F5 TTS response into the TTS result structure"""
+        if 'audio' in final_result and 'url' in final_result['audio']:
+            return {
+                'status': 'success',
+                'audio_url': final_result['audio']['url'],
+                'duration': final_result.get('duration', target_duration),
+                'sample_rate': self.f5_tts_config['sample_rate'],
+                'format': 'wav'
+            }
+        else:
+            raise Exception("No audio URL in F5 TTS result")
+    
     def _process_and_optimize_audio(self, audio_result: Dict, target_duration: float) -> Dict:
         """Process and optimize generated audio for social media"""
         
@@ -404,28 +803,67 @@ class AudioGenerator:
                 return self._create_mock_audio_file(audio_result, target_duration)
                 
         except Exception as e:
-            print(f"⚠️  Audio processing error: {e}")
+            logger.warning("⚠️  Audio processing error: %s", e)
             return self._create_mock_audio_file(audio_result, target_duration)
     
+    def _cache_tts_audio(self, audio_result: Dict) -> bool:
+        """Download (or stitch) a finished TTS job straight into the audio cache
+        
+        Returns whether the entry is now cached. If it is not (e.g. the cache directory
+        is not writable), tts_result still describes the audio for _process_tts_audio.
+        """
+        tts_result = audio_result['tts_result']
+        cache_key = audio_result['cache_key']
+        cache_metadata = {
+            'voice_style': audio_result.get('voice_style', ''),
+            'script_preview': audio_result.get('script_content', '')[:80]
+        }
+        
+        try:
+            if 'segment_paths' in tts_result:
+                # Sentence segments were already downloaded as each TTS job finished
+                stitched_path = f"{self._audio_folder_prefix}narration_{time.time_ns()}_stitched.wav"
+                if not self._stitch_segments(tts_result['segment_paths'], stitched_path):
+                    raise Exception("Failed to stitch TTS segments")
+                del tts_result['segment_paths']
+                tts_result['stitched_path'] = stitched_path
+                self.audio_cache.store(cache_key, stitched_path, cache_metadata)
+            elif tts_result.get('status') == 'success' and 'audio_url' in tts_result:
+                logger.info("   💾 Downloading TTS audio...")
+                audio_buffer = self._fetch_audio_buffer(tts_result['audio_url'])
+                self.audio_cache.store_bytes(cache_key, audio_buffer.getbuffer(), cache_metadata)
+            else:
+                return False
+        except Exception as e:
+            logger.warning("   ⚠️  Caching TTS audio failed: %s", e)
+            return False
+        
+        if self.audio_cache.lookup(cache_key) is None:
+            return False
+        if 'stitched_path' in tts_result:
+            self._remove_files([tts_result.pop('stitched_path')])
+        return True
+    
     def _process_tts_audio(self, audio_result: Dict, target_duration: float) -> Dict:
         """Process TTS audio from FAL AI F5 TTS"""
         
         try:
             tts_result = audio_result.get('tts_result', {})
             
-            if tts_result.get('status') == 'success' and 'audio_url' in tts_result:
-                # Download audio from FAL AI
-                audio_url = tts_result['audio_url']
-                audio_filename = f"narration_{int(time.time())}.wav"
-                audio_path = os.path.join(self.audio_folder, audio_filename)
-                
-                print(f"   💾 Downloading TTS audio...")
-                success = self._download_audio(audio_url, audio_path)
+            if tts_result.get('status') == 'cache_hit':
+                audio_filename = f"narration_{time.time_ns()}.wav"
+                audio_path = f"{self._audio_folder_prefix}{audio_filename}"
+                cached_path = self.audio_cache.lookup(tts_result['cache_key'])
                 
-                if success:
-                    # Process audio with pydub if available
+                if cached_path and _soundfile()[1] is not None and self._needs_optimization(cached_path, target_duration):
+                    # Optimize straight from the cache entry; only the final WAV is written
+                    processed_path = self._write_optimized(cached_path, audio_path, target_duration)
+                elif cached_path and self.audio_cache.restore(tts_result['cache_key'], audio_path):
                     processed_path = self._optimize_audio_file(audio_path, target_duration)
-                    
+                else:
+                    processed_path = None
+                
+                if processed_path:
                     return {
                         'file_path': processed_path,
                         'filename': os.path.basename(processed_path),
@@ -434,15 +872,73 @@ class AudioGenerator:
                         'status': 'success',
                         'format': 'wav',
                         'cost_estimate': audio_result.get('cost_estimate', 0.0),
-                        'sample_rate': 44100
+                        'sample_rate': 44100,
+                        # Fresh audio goes through the cache too; only reused audio counts as a hit
+                        'cache_hit': not tts_result.get('generated', False)
                     }
                 else:
-                    raise Exception("Failed to download TTS audio")
+                    raise Exception("Failed to restore cached TTS audio")
+            
+            if tts_result.get('status') == 'success' and 'audio_url' in tts_result:
+                # Download audio from FAL AI
+                audio_url = tts_result['audio_url']
+                audio_filename = f"narration_{time.time_ns()}.wav"
+                audio_path = f"{self._audio_folder_prefix}{audio_filename}"
+                cache_key = audio_result.get('cache_key')
+                cache_metadata = {
+                    'voice_style': audio_result.get('voice_style', ''),
+                    'script_preview': audio_result.get('script_content', '')[:80]
+                }
+                
+                if not {'segment_paths', 'stitched_path'} & tts_result.keys() and _soundfile()[1] is not None:
+                    # Download into memory and write only the optimized WAV: no raw copy
+                    # is written to the reel folder and read back
+                    logger.info("   💾 Downloading TTS audio...")
+                    audio_buffer = self._fetch_audio_buffer(audio_url)
+                    if cache_key:
+                        self.audio_cache.store_bytes(cache_key, audio_buffer.getbuffer(), cache_metadata)
+                    if self._needs_optimization(audio_buffer, target_duration):
+                        processed_path = self._write_optimized(audio_buffer, audio_path, target_duration)
+                    else:
+                        with open(audio_path, 'wb') as f:
+                            f.write(audio_buffer.getbuffer())
+                        processed_path = audio_path
+                else:
+                    if 'stitched_path' in tts_result:
+                        # Stitched while caching, but the cache did not keep it
+                        os.replace(tts_result['stitched_path'], audio_path)
+                        success = True
+                    elif 'segment_paths' in tts_result:
+                        # Sentence segments were already downloaded as each TTS job finished
+                        success = self._stitch_segments(tts_result['segment_paths'], audio_path)
+                    else:
+                        logger.info("   💾 Downloading TTS audio...")
+                        success = self._download_audio(audio_url, audio_path)
+                    
+                    if not success:
+                        raise Exception("Failed to download TTS audio")
+                    
+                    if cache_key:
+                        self.audio_cache.store(cache_key, audio_path, cache_metadata)
+                    
+                    # Process audio with pydub if available
+                    processed_path = self._optimize_audio_file(audio_path, target_duration)
+                
+                return {
+                    'file_path': processed_path,
+                    'filename': os.path.basename(processed_path),
+                    'duration': target_duration,
+                    'type': 'narration',
+                    'status': 'success',
+                    'format': 'wav',
+                    'cost_estimate': audio_result.get('cost_estimate', 0.0),
+                    'sample_rate': 44100
+                }
             else:
                 raise Exception("TTS generation was not successful")
                 
         except Exception as e:
-            print(f"   ⚠️  TTS processing failed: {e}")
+            logger.warning("   ⚠️  TTS processing failed: %s", e)
             # Create mock instead
             return self._create_mock_audio_file(audio_result, target_duration)
     
@@ -460,19 +956,21 @@ class AudioGenerator:
             
             # Create mock audio content based on type
             if audio_type == 'narration':
-                audio_filename = f"mock_narration_{int(time.time())}.wav"
-                mock_content = self._generate_mock_narration_content(target_duration)
+                audio_filename = f"mock_narration_{time.time_ns()}.wav"
+                wav_header, file_size = self._generate_mock_narration_header(target_duration)
             else:  # background_music
-                audio_filename = f"mock_music_{int(time.time())}.wav"
-                mock_content = self._generate_mock_music_content(target_duration)
+                audio_filename = f"mock_music_{time.time_ns()}.wav"
+                wav_header, file_size = self._generate_mock_music_header(target_duration)
             
-            audio_path = os.path.join(self.audio_folder, audio_filename)
+            audio_path = f"{self._audio_folder_prefix}{audio_filename}"
             
-            # Write mock audio file (silence with proper duration and format)
+            # Write the WAV header, then extend the file to full size: the zero-filled
+            # (sparse where supported) tail is the silence, with no buffer built or written
             with open(audio_path, 'wb') as f:
-                f.write(mock_content)
+                f.write(wav_header)
+                os.ftruncate(f.fileno(), file_size)
             
-            print(f"   🧪 Created mock {audio_type}: {audio_filename}")
+            logger.info("   🧪 Created mock %s: %s", audio_type, audio_filename)
             
             return {
                 'file_path': audio_path,
@@ -486,7 +984,7 @@ class AudioGenerator:
             }
             
         except Exception as e:
-            print(f"   ❌ Mock audio creation failed: {e}")
+            logger.error("   ❌ Mock audio creation failed: %s", e)
             return {
                 'file_path': None,
                 'filename': None,
@@ -498,8 +996,8 @@ class AudioGenerator:
                 'error': str(e)
             }
     
-    def _generate_mock_narration_content(self, duration: float) -> bytes:
-        """Generate mock narration content (WAV format silence)"""
+    def _generate_mock_narration_header(self, duration: float) -> Tuple[bytes, int]:
+        """Generate the WAV header for mock narration silence and the total file size"""
         
         # Create a simple WAV header for the specified duration
         sample_rate = 44100
@@ -509,55 +1007,138 @@ class AudioGenerator:
         num_samples = int(duration * sample_rate)
         data_size = num_samples * channels * (bits_per_sample // 8)
         
-        # WAV header
-        header = bytearray()
-        header.extend(b'RIFF')
-        header.extend((data_size + 36).to_bytes(4, 'little'))
-        header.extend(b'WAVE')
-        header.extend(b'fmt ')
-        header.extend((16).to_bytes(4, 'little'))
-        header.extend((1).to_bytes(2, 'little'))  # PCM format
-        header.extend(channels.to_bytes(2, 'little'))
-        header.extend(sample_rate.to_bytes(4, 'little'))
-        header.extend((sample_rate * channels * bits_per_sample // 8).to_bytes(4, 'little'))
-        header.extend((channels * bits_per_sample // 8).to_bytes(2, 'little'))
-        header.extend(bits_per_sample.to_bytes(2, 'little'))
-        header.extend(b'data')
-        header.extend(data_size.to_bytes(4, 'little'))
-        
-        # Add silence data
-        audio_data = b'\x00' * data_size
-        
-        return bytes(header) + audio_data
-    
-    def _generate_mock_music_content(self, duration: float) -> bytes:
-        """Generate mock music content (WAV format silence)"""
+        # WAV header (PCM format)
+        header = _WAV_HEADER.pack(
+            b'RIFF', data_size + 36, b'WAVE',
+            b'fmt ', 16, 1, channels, sample_rate,
+            sample_rate * channels * bits_per_sample // 8,
+            channels * bits_per_sample // 8, bits_per_sample,
+            b'data', data_size
+        )
+        
+        return header, _WAV_HEADER.size + data_size
+    
+    def _generate_mock_music_header(self, duration: float) -> Tuple[bytes, int]:
+        """Generate the WAV header for mock music silence and the total file size"""
         
         # For Phase 5, same as narration but could be enhanced later
-        return self._generate_mock_narration_content(duration)
+        return self._generate_mock_narration_header(duration)
     
     def _download_audio(self, audio_url: str, output_path: str) -> bool:
         """Download audio from URL to local file"""
         
         try:
-            response = requests.get(audio_url, stream=True, timeout=60)
+            # Audio is already compressed: ask for identity encoding and write the raw
+            # stream, skipping the content-decoding layer entirely
+            with self.http_client.stream('GET', audio_url, headers={'Accept-Encoding': 'identity'}) as response:
+                response.raise_for_status()
+                
+                chunks = response.iter_raw(chunk_size=_DOWNLOAD_CHUNK_SIZE)
+                
+                # Check the magic bytes before touching disk so an error page or
+                # truncated body fails after one chunk instead of a full download
+                first_chunk = next(chunks, b'')
+                if not _looks_like_audio(first_chunk):
+                    raise InvalidAudioError(f"Response is not WAV/MP3 audio (starts with {first_chunk[:12]!r})")
+                
+                with open(output_path, 'wb') as f:
+                    self._preallocate(f, response.headers.get('Content-Length'))
+                    f.write(first_chunk)
+                    # writelines drains the iterator in C, so the copy loop never runs in Python
+                    f.writelines(chunks)
+                    f.truncate()
+            
+            return True
+        except InvalidAudioError:
+            raise
+        except Exception as e:
+            logger.error("   ❌ Audio download failed: %s", e)
+            return False
+    
+    def _fetch_audio_buffer(self, audio_url: str) -> io.BytesIO:
+        """Download audio into memory (raises on HTTP errors or a non-audio body)
+
+        Chunks are appended to one BytesIO as they arrive, so the payload is never
+        concatenated or copied again; callers write it out through getbuffer().
+        """
+        with self.http_client.stream('GET', audio_url, headers={'Accept-Encoding': 'identity'}) as response:
             response.raise_for_status()
             
+            chunks = response.iter_raw(chunk_size=_DOWNLOAD_CHUNK_SIZE)
+            first_chunk = next(chunks, b'')
+            if not _looks_like_audio(first_chunk):
+                raise InvalidAudioError(f"Response is not WAV/MP3 audio (starts with {first_chunk[:12]!r})")
+            
+            buffer = io.BytesIO()
+            buffer.write(first_chunk)
+            for chunk in chunks:
+                buffer.write(chunk)
+            buffer.seek(0)
+            return buffer
+    
+    async def _download_audio_async(self, audio_url: str, output_path: str):
+        """Download audio on the shared loop with the pooled AsyncClient (raises on failure)"""
+        async with get_async_client().stream('GET', audio_url, headers={'Accept-Encoding': 'identity'}) as response:
+            response.raise_for_status()
+            
+            chunks = response.aiter_raw(chunk_size=_DOWNLOAD_CHUNK_SIZE)
+            first_chunk = await anext(chunks, b'')
+            if not _looks_like_audio(first_chunk):
+                raise InvalidAudioError(f"Response is not WAV/MP3 audio (starts with {first_chunk[:12]!r})")
+            
+            # Page-cache writes of 1 MiB blocks are short enough to do on the loop
             with open(output_path, 'wb') as f:
-                for chunk in response.iter_content(chunk_size=8192):
+                self._preallocate(f, response.headers.get('Content-Length'))
+                f.write(first_chunk)
+                async for chunk in chunks:
                     f.write(chunk)
-            
+                f.truncate()
+    
+    def _stitch_segments(self, segment_paths: List[str], output_path: str) -> bool:
+        """Concatenate downloaded sentence segments into one WAV, removing the segment files"""
+        try:
+            AudioSegment = _pydub()
+            combined = AudioSegment.empty()
+            for segment_path in segment_paths:
+                combined = combined.append(AudioSegment.from_file(segment_path), crossfade=0)
+            combined.export(output_path, format='wav')
             return True
-        except Exception as e:
-            print(f"   ❌ Audio download failed: {e}")
-            return False
+        finally:
+            self._remove_files(segment_paths)
+    
+    @staticmethod
+    def _remove_files(paths: List[str]):
+        """Best-effort removal of temporary files"""
+        for path in paths:
+            try:
+                os.remove(path)
+            except OSError:
+                pass
+    
+    @staticmethod
+    def _preallocate(f, content_length: Optional[str]):
+        """Size the file up front so the filesystem can allocate it contiguously"""
+        if content_length and content_length.isdigit():
+            f.truncate(int(content_length))
     
     def _optimize_audio_file(self, audio_path: str, target_duration: float) -> str:
         """Optimize audio file using pydub for social media"""
         
         try:
+            if _soundfile()[1] is not None:
+                if not self._needs_optimization(audio_path, target_duration):
+                    return audio_path
+                return self._write_optimized(audio_path, audio_path.replace('.wav', '_optimized.wav'), target_duration)
+            
+            if _ffmpeg() is not None:
+                optimized_path = audio_path.replace('.wav', '_optimized.wav')
+                run_coroutine(self._optimize_with_ffmpeg(audio_path, optimized_path, target_duration), timeout=_FFMPEG_TIMEOUT)
+                logger.info("   ✅ Audio optimized: %s", os.path.basename(optimized_path))
+                return optimized_path
+            
+            AudioSegment = _pydub()
             if AudioSegment is None:
-                print(f"   ⚠️  pydub not available, returning original file")
+                logger.warning("   ⚠️  pydub not available, returning original file")
                 return audio_path
                 
             # Load audio with pydub
@@ -589,13 +1170,62 @@ class AudioGenerator:
             optimized_path = audio_path.replace('.wav', '_optimized.wav')
             optimized_audio.export(optimized_path, format='wav')
             
-            print(f"   ✅ Audio optimized: {os.path.basename(optimized_path)}")
+            logger.info("   ✅ Audio optimized: %s", os.path.basename(optimized_path))
             return optimized_path
             
         except Exception as e:
-            print(f"   ⚠️  Audio optimization failed: {e}")
+            logger.warning("   ⚠️  Audio optimization failed: %s", e)
             return audio_path  # return original if optimization fails
     
+    @staticmethod
+    async def _optimize_with_ffmpeg(source_path: str, output_path: str, target_duration: float):
+        """Normalize, fit to duration and convert to 44.1kHz mono 16-bit in one ffmpeg decode/encode"""
+        proc = await asyncio.create_subprocess_exec(
+            _ffmpeg(), '-y', '-loglevel', 'error', '-i', source_path,
+            '-af', _FFMPEG_FILTERGRAPH, '-t', f"{target_duration:.3f}",
+            '-ar', '44100', '-ac', '1', '-c:a', 'pcm_s16le', output_path,
+            stdout=asyncio.subprocess.DEVNULL, stderr=asyncio.subprocess.PIPE
+        )
+        try:
+            _, stderr = await proc.communicate()
+        except asyncio.CancelledError:
+            proc.kill()
+            raise
+        if proc.returncode != 0:
+            raise Exception(f"ffmpeg exited with {proc.returncode}: {stderr.decode(errors='replace').strip()}")
+    
+    @staticmethod
+    def _needs_optimization(source, target_duration: float) -> bool:
+        """Probe the header only: 16-bit 44.1kHz mono WAV at the target length is left as is"""
+        sf = _soundfile()[1]
+        try:
+            info = sf.info(source)
+        except Exception:
+            return True
+        finally:
+            if hasattr(source, 'seek'):
+                source.seek(0)
+        
+        return not (
+            info.format == 'WAV' and info.subtype == 'PCM_16'
+            and info.samplerate == 44100 and info.channels == 1
+            and abs(info.duration - target_duration) < 0.05
+        )
+    
+    def _write_optimized(self, source, output_path: str, target_duration: float) -> str:
+        """Optimize audio from a path or file object and write it once to output_path
+        
+        With AUDIO_PROCESS_WORKERS set the work runs in the shared process pool,
+        otherwise in the calling thread.
+        """
+        pool = _audio_process_pool()
+        if pool is not None:
+            pool.submit(_optimize_with_soundfile, source, output_path, target_duration).result()
+        else:
+            _optimize_with_soundfile(source, output_path, target_duration)
+        logger.info("   ✅ Audio optimized: %s", os.path.basename(output_path))
+        return output_path
+    
     def _validate_audio_quality(self, audio_data: Dict) -> Dict:
         """Validate audio quality for social media standards"""
         
@@ -603,7 +1233,13 @@ class AudioGenerator:
             file_path = audio_data.get('file_path')
             audio_status = audio_data.get('status', 'unknown')
             
-            if not file_path or not os.path.exists(file_path):
+            # One stat() call covers both the existence check and the size
+            try:
+                file_size = os.stat(file_path).st_size if file_path else None
+            except FileNotFoundError:
+                file_size = None
+            
+            if file_size is None:
                 return {
                     'audio_quality_score': 0.0,
                     'sync_ready': False,
@@ -612,9 +1248,6 @@ class AudioGenerator:
                     'validation_notes': 'Audio file not found'
                 }
             
-            # Basic file validation
-            file_size = os.path.getsize(file_path)
-            
             if file_size == 0:
                 return {
                     'audio_quality_score': 0.0,
@@ -662,12 +1295,10 @@ class AudioGenerator:
                 'validation_notes': f'Validation error: {str(e)}'
             }
     
-    def _calculate_tts_cost(self, script: str) -> float:
+    @staticmethod
+    def _calculate_tts_cost(script: str) -> float:
         """Calculate FAL AI F5 TTS cost based on character count"""
-        
-        char_count = len(script)
-        cost = (char_count / 1000) * self.f5_tts_config['cost_per_1000_chars']
-        return round(cost, 4)
+        return round(len(script) * _TTS_COST_PER_CHAR, 4)
     
     def _create_mock_narration(self, script: str, duration: float, voice_style: str) -> Dict:
         """Create mock narration result for testing"""
@@ -678,12 +1309,7 @@ class AudioGenerator:
             'voice_style': voice_style,
             'cost_estimate': self._calculate_tts_cost(script),
             'status': 'mock',
-            'tts_result': {
-                'status': 'mock',
-                'duration': duration,
-                'sample_rate': 44100,
-                'format': 'wav'
-            }
+            'tts_result': {**_MOCK_AUDIO, 'duration': duration}
         }
     
     def _create_mock_background_music(self, theme: str, duration: float) -> Dict:
@@ -694,32 +1320,17 @@ class AudioGenerator:
             'theme': theme,
             'cost_estimate': 0.0,  # Free for mock
             'status': 'mock',
-            'music_result': {
-                'status': 'mock',
-                'duration': duration,
-                'sample_rate': 44100,
-                'format': 'wav',
-                'theme': theme
-            }
+            'music_result': {**_MOCK_AUDIO, 'duration': duration, 'theme': theme}
         }
     
-    def _create_error_result(self, error: str, content_mode: str, context: Dict) -> Dict:
+    def _create_error_result(self, error: str, content_mode: str, context: Dict) -> AudioResult:
         """Create error result structure"""
         
-        return {
-            'audio_generation_status': 'failed',
-            'content_mode': content_mode,
-            'generated_audio': {
-                'file_path': None,
-                'filename': None,
-                'duration': 0,
-                'type': content_mode,
-                'status': 'failed',
-                'format': 'wav',
-                'cost_estimate': 0.0,
-                'error': error
-            },
-            'generation_summary': {
+        return AudioResult(
+            audio_generation_status='failed',
+            content_mode=content_mode,
+            generated_audio={**_FAILED_GENERATED_AUDIO, 'type': content_mode, 'error': error},
+            generation_summary={
                 'audio_type': content_mode,
                 'duration': 0,
                 'theme': context.get('audio_theme', 'unknown'),
@@ -727,35 +1338,11 @@ class AudioGenerator:
                 'status': 'failed',
                 'error': error
             },
-            'quality_assessment': {
-                'audio_quality_score': 0.0,
-                'sync_ready': False,
-                'format_compliance': False,
-                'ready_for_synchronization': False,
-                'validation_notes': f'Generation failed: {error}'
-            },
-            'next_phase_data': {
-                'audio_folder': self.audio_folder,
-                'final_audio_file': '',
-                'audio_duration': 0,
-                'video_clips': 0,
-                'ready_for_phase_6': False
-            },
-            'error': error
-        }
+            quality_assessment={**_FAILED_QUALITY, 'validation_notes': f'Generation failed: {error}'},
+            next_phase_data={'audio_folder': self.audio_folder, **_FAILED_NEXT_PHASE},
+            error=error
+        )
 
-    def get_cost_estimates(self) -> Dict:
-        """Get cost estimates for different audio generation modes"""
-        
-        return {
-            'narration_mode': {
-                'cost_per_1000_chars': self.f5_tts_config['cost_per_1000_chars'],
-                'typical_script_chars': 400,  # ~20 second narration
-                'estimated_cost': 0.02
-            },
-            'music_mode': {
-                'cost_per_generation': 0.0,  # Free in development phase
-                'typical_duration': 20,
-                'estimated_cost': 0.0
-            }
-        }
\ No newline at end of file
+    def get_cost_estimates(self) -> Dict[str, Dict[str, Any]]:
+        """Get cost estimates for different audio generation modes (a copy the caller may modify or serialize)"""
+        return {mode: dict(estimate) for mode, estimate in _COST_ESTIMATES.items()}
\ No newline at end of file
@@ -2,27 +2,302 @@
 Claude prompt refinement and quality assessment service
 """
 
+import asyncio
 import json
 import re
+from collections import Counter
+from functools import lru_cache
 from typing import Dict, List, Any, Optional
 import anthropic
 from decouple import config
+from .async_runtime import HTTP2_AVAILABLE, AsyncTokenBucket, run_coroutine
+from .logging_config import get_logger
+from .response_cache import ResponseCache, response_cache_key
+from .utils import compact_json_dumps, env_setting, fast_json_loads
+
+logger = get_logger(__name__)
+
+# Resolved once at import (decouple consults os.environ, then .env/settings.ini) instead of per service instance
+_CLAUDE_API_KEY = config('CLAUDE_API_KEY', default='')
+
+# Requests per minute allowed to Anthropic from this process, and retries (exponential
+# backoff with jitter, honouring retry-after) the SDK makes on 429/529/timeouts before giving up
+_CLAUDE_RPM = env_setting('CLAUDE_RPM', default=50.0, cast=float)
+_CLAUDE_OUTPUT_TPM = env_setting('CLAUDE_OUTPUT_TPM', default=16000.0, cast=float)
+_CLAUDE_MAX_RETRIES = env_setting('CLAUDE_MAX_RETRIES', default=5, cast=int)
+
+# Shared by every service instance: a scene fan-out bursts up to 8 calls, then settles to _CLAUDE_RPM
+_CLAUDE_BUCKET = AsyncTokenBucket(rate_per_sec=_CLAUDE_RPM / 60, capacity=8)
+# Output-token budget: each call reserves its max_tokens, up to a minute's worth at once
+_CLAUDE_OUTPUT_BUCKET = AsyncTokenBucket(rate_per_sec=_CLAUDE_OUTPUT_TPM / 60, capacity=_CLAUDE_OUTPUT_TPM)
+
+# Every Claude call streams; a stream that goes this long without a chunk is treated as dead
+# (the SDK applies it as the per-read timeout, not as a cap on the whole response)
+_CLAUDE_IDLE_TIMEOUT = env_setting('CLAUDE_IDLE_TIMEOUT', default=30.0, cast=float)
+# Connecting and waiting for a pooled connection fail fast instead of sharing the idle budget
+_CLAUDE_TIMEOUT = anthropic.Timeout(_CLAUDE_IDLE_TIMEOUT, connect=5.0, pool=5.0)
+
+# Static instructions sent as the (cached) system prompt; only the reel-specific data goes in the user turn
+_REFINEMENT_SYSTEM = """
+You are an expert AI video generation prompt engineer. Your task is to refine and optimize a video generation prompt for maximum quality and engagement.
+
+The user message gives the reel CONTEXT, its VISUAL STYLE and the ORIGINAL SCENE.
+
+TASK: Refine this scene's description into a professional video generation prompt optimized for AI models like Runway, Pika, or Hailuo.
+
+CRITICAL: The video MUST be in VERTICAL 9:16 format for social media reels (1080x1920 resolution).
+
+PROVIDE:
+1. **Enhanced Prompt**: Professional, detailed description with VERTICAL format specifications and "9:16 aspect ratio" explicitly mentioned
+2. **Quality Score**: Predicted success rate (0.0-1.0)
+3. **Model Recommendation**: Best AI model for this specific prompt
+4. **Technical Parameters**: Resolution (1080x1920), duration, style parameters, vertical format
+5. **Alternative Versions**: 2-3 variations for fallback options
+6. **Quality Breakdown**: Technical feasibility, creative appeal and engagement potential (0.0-1.0)
+7. **Model Tip**: One tip for getting the best result from the recommended model
+
+Record the result with the emit_refined_prompt tool.
+
+Use the original scene's scene_number. Focus on creating a prompt that will generate visually stunning, engaging video content optimized for social media success.
+"""
+
+_QUALITY_SYSTEM = """
+You are an expert video content quality assessor specializing in social media reels. Analyze the reel data in the user message and provide comprehensive quality scores.
+
+ASSESSMENT CRITERIA:
+1. **Technical Quality** (0.0-1.0): Resolution, sync, compression, format compliance
+2. **Content Quality** (0.0-1.0): Narrative flow, visual appeal, pacing
+3. **Brand Alignment** (0.0-1.0): Consistency with brand voice and messaging
+4. **Platform Optimization** (0.0-1.0): Platform-specific requirements met
+5. **Engagement Potential** (0.0-1.0): Predicted audience engagement and retention
+
+QUALITY THRESHOLDS:
+- PASS: Overall score ≥ 0.75
+- RELOOP REQUIRED: Overall score < 0.75
+
+Record the scores with the emit_quality_scores tool, scores first.
+
+Provide detailed analysis and actionable recommendations for improvement.
+"""
+
+_IMPROVEMENT_SYSTEM = """
+You are an expert video improvement consultant. Based on the quality report and original storyboard in the user message, provide specific, actionable improvement recommendations.
+
+PROVIDE:
+1. **Priority Issues**: Most critical problems to address
+2. **Specific Actions**: Concrete steps to improve each quality dimension
+3. **Reloop Strategy**: Recommended approach for regeneration
+4. **Success Metrics**: How to measure improvement
+
+OUTPUT: List of specific, actionable improvement recommendations.
+"""
+
+# Forced tool calls: Claude returns these shapes as JSON tool input instead of free-form text
+_REFINEMENT_TOOL = {
+    'name': 'emit_refined_prompt',
+    'description': "Record the refined video generation prompt for the scene",
+    'input_schema': {
+        'type': 'object',
+        'properties': {
+            'scene_number': {'type': 'integer'},
+            'enhanced_prompt': {
+                'type': 'string',
+                'description': "Professional vertical video prompt, 9:16 aspect ratio, 1080x1920 resolution, with technical details"
+            },
+            'quality_prediction': {'type': 'number', 'minimum': 0, 'maximum': 1},
+            'recommended_model': {'type': 'string', 'description': "e.g. hailuo-02, runway-gen3, pika"},
+            'technical_params': {
+                'type': 'object',
+                'properties': {
+                    'resolution': {'type': 'string'},
+                    'duration': {'type': 'integer'},
+                    'style': {'type': 'string'},
+                    'camera_movement': {'type': 'string'}
+                }
+            },
+            'alternative_prompts': {'type': 'array', 'items': {'type': 'string'}},
+            'technical_feasibility': {'type': 'number', 'minimum': 0, 'maximum': 1},
+            'creative_appeal': {'type': 'number', 'minimum': 0, 'maximum': 1},
+            'engagement_potential': {'type': 'number', 'minimum': 0, 'maximum': 1},
+            'model_tip': {'type': 'string'},
+            'analysis': {'type': 'string', 'description': "Short analysis of the prompt improvements"},
+            'improvements': {'type': 'array', 'items': {'type': 'string'}}
+        },
+        'required': ['scene_number', 'enhanced_prompt', 'quality_prediction', 'recommended_model', 'technical_params']
+    }
+}
+
+_SCORE = {'type': 'number', 'minimum': 0, 'maximum': 1}
+
+_QUALITY_TOOL = {
+    'name': 'emit_quality_scores',
+    'description': "Record the quality scores, analysis and recommendations for the reel",
+    'input_schema': {
+        'type': 'object',
+        'properties': {
+            'technical_quality': _SCORE,
+            'content_quality': _SCORE,
+            'brand_alignment': _SCORE,
+            'platform_optimization': _SCORE,
+            'engagement_potential': _SCORE,
+            'overall_score': _SCORE,
+            'analysis': {'type': 'string'},
+            'recommendations': {'type': 'array', 'items': {'type': 'string'}}
+        },
+        'required': ['technical_quality', 'content_quality', 'brand_alignment', 'platform_optimization',
+                     'engagement_potential', 'overall_score']
+    }
+}
+
+# Score fields of a streamed quality assessment; the trailing delimiter means the number is complete
+_SCORE_FIELD = re.compile(
+    r'"(technical_quality|content_quality|brand_alignment|platform_optimization|engagement_potential|overall_score)"'
+    r'\s*:\s*(\d+(?:\.\d+)?)\s*[,}\n]'
+)
+
+_JSON_DECODER = json.JSONDecoder()
+
+_LIST_MARKER_RE = re.compile(r'^[-•*\d\.\s]+')
+
+
+def _extract_json_object(text: str) -> Optional[Dict]:
+    """Decode the first complete JSON object in text, ignoring prose around it (None if there is none)
+
+    raw_decode scans once from each candidate '{' and stops at its matching brace,
+    instead of a greedy '{.*}' match that spans to the last brace in the text.
+    """
+    start = text.find('{')
+    if start == -1:
+        return None
+
+    # Usual case: the answer is one object, maybe fenced or wrapped in prose; let orjson decode it whole
+    end = text.rfind('}')
+    try:
+        obj = fast_json_loads(text[start:end + 1])
+    except ValueError:
+        obj = None
+    if isinstance(obj, dict):
+        return obj
+
+    while start != -1:
+        try:
+            obj, _ = _JSON_DECODER.raw_decode(text, start)
+        except ValueError:
+            obj = None
+        if isinstance(obj, dict):
+            return obj
+        start = text.find('{', start + 1)
+    return None
+
+
+def _message_text(message) -> str:
+    """The answer of a Message as text: tool input as JSON, otherwise the joined text blocks"""
+    for block in message.content:
+        if block.type == 'tool_use':
+            return compact_json_dumps(block.input)
+    return ''.join(block.text for block in message.content if block.type == 'text')
+
+
+# Per-scene breakdown scores averaged into the refinement's quality_predictions
+_PREDICTION_FIELDS = ('technical_feasibility', 'creative_appeal', 'engagement_potential')
+
+# Fields Claude actually reads; URLs, file paths and model metadata only cost input tokens
+_SCENE_FIELDS = ('scene_number', 'duration', 'title', 'description', 'visual_elements', 'key_message', 'technical_notes')
+_REEL_FIELDS = ('platform', 'duration', 'content_mode')
+_QUALITY_FIELDS = ('technical_quality', 'content_quality', 'brand_alignment', 'platform_optimization',
+                   'engagement_potential', 'overall_score')
+
+
+def _slim_scene(scene: Dict) -> Dict:
+    """The storyboard fields of a scene, without anything added by later pipeline stages"""
+    return {k: scene[k] for k in _SCENE_FIELDS if k in scene}
+
+
+def _slim_scenes(scenes: Any) -> List:
+    """_slim_scene over a scene list (non-dict entries are kept as they are)"""
+    return [_slim_scene(s) if isinstance(s, dict) else s for s in scenes or []]
+
+
+def _slim_reel(reel_data: Dict) -> Dict:
+    """Scenes, audio type/duration and platform settings of a reel (the full data if none are present)"""
+    slim = {k: reel_data[k] for k in _REEL_FIELDS if k in reel_data}
+    scenes = reel_data.get('scenes') or reel_data.get('storyboard', {}).get('scenes')
+    if scenes:
+        slim['scenes'] = _slim_scenes(scenes)
+    audio = reel_data.get('audio')
+    if isinstance(audio, dict):
+        slim['audio'] = {k: audio[k] for k in ('type', 'duration') if k in audio}
+    return slim or reel_data
+
+
+def _slim_storyboard(storyboard_data: Dict) -> Dict:
+    """Scenes and visual style of a storyboard"""
+    return {
+        'scenes': _slim_scenes(storyboard_data.get('storyboard', {}).get('scenes')),
+        'visual_style': storyboard_data.get('visual_style', {})
+    }
+
+
+def _slim_quality(quality_report: Dict) -> Dict:
+    """The scores and top three recommendations of a quality report"""
+    slim = {k: quality_report[k] for k in _QUALITY_FIELDS if k in quality_report}
+    slim['recommendations'] = list(quality_report.get('recommendations', []))[:3]
+    return slim
+
+
+@lru_cache(maxsize=4)
+def _get_anthropic(api_key: str) -> anthropic.Anthropic:
+    """Process-wide sync client per key, so every service instance shares one connection pool"""
+    return anthropic.Anthropic(api_key=api_key, max_retries=_CLAUDE_MAX_RETRIES, http_client=anthropic.DefaultHttpxClient(http2=HTTP2_AVAILABLE))
+
+
+@lru_cache(maxsize=4)
+def _get_async_anthropic(api_key: str) -> anthropic.AsyncAnthropic:
+    """Process-wide async client per key (only used from the shared async runtime loop)
+
+    The SDK's own transport is kept (its pool limits already exceed the service's
+    semaphore); HTTP/2 is switched on when h2 is installed so concurrent scene
+    refinements multiplex over one TLS connection.
+    """
+    return anthropic.AsyncAnthropic(
+        api_key=api_key,
+        max_retries=_CLAUDE_MAX_RETRIES,
+        http_client=anthropic.DefaultAsyncHttpxClient(http2=HTTP2_AVAILABLE)
+    )
 
 
 class ClaudeRefinementService:
     """Claude-powered prompt optimization and quality assessment"""
     
-    def __init__(self, claude_api_key=None):
-        self.claude_api_key = claude_api_key or config('CLAUDE_API_KEY', default='')
+    # Output budgets sized to the answers' JSON/list formats; an answer cut off at
+    # its budget is retried once with twice the budget
+    # Refinement needs Sonnet's reasoning; scoring and listing suggestions are fine on Haiku,
+    # which escalates to the refinement model when its answer cannot be parsed
+    REFINE_MODEL = "claude-3-5-sonnet-20241022"
+    ASSESS_MODEL = "claude-3-5-haiku-20241022"
+    IMPROVE_MODEL = "claude-3-5-haiku-20241022"
+    
+    REFINE_MAX_TOKENS = 1500
+    ASSESS_MAX_TOKENS = 800
+    IMPROVE_MAX_TOKENS = 600
+    
+    def __init__(self, claude_api_key=None, max_concurrency: int = 8, early_exit_threshold: float = 0.9):
+        self.claude_api_key = claude_api_key or _CLAUDE_API_KEY
+        self.max_concurrency = max_concurrency
+        # Quality assessments scoring at least this stop streaming before the analysis text
+        self.early_exit_threshold = early_exit_threshold
+        self.response_cache = ResponseCache()
         if self.claude_api_key:
-            self.claude = anthropic.Anthropic(api_key=self.claude_api_key)
+            self.claude = _get_anthropic(self.claude_api_key)
+            self.async_claude = _get_async_anthropic(self.claude_api_key)
         else:
             self.claude = None
+            self.async_claude = None
     
     def refine_video_prompts(self, storyboard_data: Dict, context: Dict) -> Dict:
         """Optimize prompts for video generation using Claude AI"""
         if not self.claude:
-            print("⚠️  Claude API not available - using basic prompt optimization")
+            logger.warning("⚠️  Claude API not available - using basic prompt optimization")
             return self._fallback_prompt_refinement(storyboard_data)
         
         try:
@@ -31,86 +306,188 @@ class ClaudeRefinementService:
             visual_style = storyboard_data.get('visual_style', {})
             content_analysis = storyboard_data.get('content_analysis', {})
             
-            # Create comprehensive refinement prompt for Claude
-            refinement_prompt = self._build_claude_refinement_prompt(scenes, visual_style, content_analysis, context)
-            
-            # Call Claude API
-            response = self.claude.messages.create(
-                model="claude-3-5-sonnet-20241022",
-                max_tokens=4000,
-                temperature=0.3,
-                messages=[
-                    {
-                        "role": "user",
-                        "content": refinement_prompt
-                    }
-                ]
-            )
-            
-            # Parse Claude's response
-            claude_response = response.content[0].text
-            refined_data = self._parse_claude_refinement_response(claude_response)
+            if not scenes:
+                return self._fallback_prompt_refinement(storyboard_data)
             
-            return {
-                'status': 'success',
-                'original_storyboard': storyboard_data,
-                'refined_prompts': refined_data.get('refined_prompts', []),
-                'quality_predictions': refined_data.get('quality_predictions', {}),
-                'model_optimizations': refined_data.get('model_optimizations', {}),
-                'claude_analysis': refined_data.get('analysis', ''),
-                'improvement_suggestions': refined_data.get('improvements', []),
-                'timestamp': context.get('timestamp', '')
-            }
+            # Refine every scene concurrently; a failed scene falls back on its own
+            scene_results = run_coroutine(self._refine_scenes_async(scenes, visual_style, content_analysis, context))
+            return self._build_refinement_result(storyboard_data, scenes, scene_results, context)
             
         except Exception as e:
-            print(f"❌ Error in Claude refinement: {e}")
+            logger.error("❌ Error in Claude refinement: %s", e)
             return self._fallback_prompt_refinement(storyboard_data)
     
+    def _build_refinement_result(self, storyboard_data: Dict, scenes: List[Dict], scene_results: List[Any], context: Dict) -> Dict:
+        """Combine per-scene results (exceptions fall back per scene) into the refinement result"""
+        refined_prompts = []
+        for scene, result in zip(scenes, scene_results):
+            if isinstance(result, BaseException):
+                logger.warning("⚠️  Scene %s refinement failed: %s", scene.get('scene_number', '?'), result)
+                result = self._fallback_scene_refinement(scene)
+            refined_prompts.append(result)
+        
+        return {
+            'status': 'success',
+            'original_storyboard': storyboard_data,
+            'refined_prompts': refined_prompts,
+            'quality_predictions': self._aggregate_quality_predictions(refined_prompts),
+            'model_optimizations': self._aggregate_model_optimizations(refined_prompts),
+            # Scenes often repeat the same advice: keep each analysis and suggestion once, in scene order
+            'claude_analysis': '\n'.join(dict.fromkeys(filter(None, (p.pop('analysis', '') for p in refined_prompts)))),
+            'improvement_suggestions': list(dict.fromkeys(i for p in refined_prompts for i in p.pop('improvements', []))),
+            'timestamp': context.get('timestamp', '')
+        }
+    
+    async def _refine_scenes_async(self, scenes: List[Dict], visual_style: Dict, content_analysis: Dict, context: Dict) -> List[Any]:
+        """Refine all scenes with bounded concurrency, returning results (or exceptions) in scene order"""
+        semaphore = asyncio.Semaphore(self.max_concurrency)
+        return await asyncio.gather(
+            *(self._refine_one(scene, visual_style, content_analysis, context, semaphore) for scene in scenes),
+            return_exceptions=True
+        )
+    
+    async def _refine_one(self, scene: Dict, visual_style: Dict, content_analysis: Dict, context: Dict,
+                          semaphore: asyncio.Semaphore) -> Dict:
+        """Refine a single scene's prompt with one Claude call"""
+        refinement_prompt = self._build_claude_refinement_prompt(scene, visual_style, content_analysis, context)
+        params = self._message_params(self.REFINE_MODEL, _REFINEMENT_SYSTEM, refinement_prompt, max_tokens=self.REFINE_MAX_TOKENS,
+                                      temperature=0.3, tool=_REFINEMENT_TOOL)
+        cache_key = response_cache_key(params)
+        
+        claude_response = self.response_cache.get(cache_key)
+        if claude_response is None:
+            async with semaphore:
+                for _ in range(2):
+                    await _CLAUDE_BUCKET.acquire()
+                    await _CLAUDE_OUTPUT_BUCKET.acquire(params['max_tokens'])
+                    async with self.async_claude.messages.stream(**params, timeout=_CLAUDE_TIMEOUT) as stream:
+                        message = await stream.get_final_message()
+                    claude_response = _message_text(message)
+                    stop_reason = message.stop_reason
+                    if stop_reason != 'max_tokens':
+                        break
+                    params = self._double_budget(params)
+            if stop_reason != 'max_tokens':
+                self.response_cache.set(cache_key, claude_response)  # Only complete answers are cached
+        
+        return self._parse_scene_refinement(scene, claude_response)
+    
+    def _parse_scene_refinement(self, scene: Dict, claude_response: str) -> Dict:
+        """Parse one scene's refinement answer and tag it with the scene it refines"""
+        refined_data = self._parse_claude_refinement_response(claude_response)
+        if 'enhanced_prompt' not in refined_data:
+            raise ValueError("refinement answer has no enhanced_prompt")
+        
+        refined_data['scene_number'] = scene.get('scene_number', refined_data.get('scene_number', 1))
+        refined_data['original_description'] = scene.get('description', refined_data.get('original_description', ''))
+        return refined_data
+    
+    def _aggregate_quality_predictions(self, refined_prompts: List[Dict]) -> Dict:
+        """Average per-scene predictions into the overall prediction (breakdown scores are moved off the scenes)"""
+        scores = [p.get('quality_prediction', 0.75) for p in refined_prompts]
+        overall_score = round(sum(scores) / len(scores), 3)
+        predictions = {'overall_score': overall_score}
+        for field in _PREDICTION_FIELDS:
+            values = [p.pop(field) for p in refined_prompts if isinstance(p.get(field), (int, float))]
+            # Scenes without a breakdown (fallbacks) leave the field at the overall score
+            predictions[field] = round(sum(values) / len(values), 3) if values else overall_score
+        return predictions
+    
+    def _aggregate_model_optimizations(self, refined_prompts: List[Dict]) -> Dict:
+        """Pick the most recommended model as primary and the others as fallbacks, collecting each scene's model tip"""
+        ranked = [model for model, _ in Counter(p.get('recommended_model', 'hailuo-02') for p in refined_prompts).most_common()]
+        tips = (p.pop('model_tip', '') for p in refined_prompts)
+        return {
+            'primary_model': ranked[0],
+            'fallback_models': ranked[1:],
+            'model_specific_tips': list(dict.fromkeys(filter(None, tips)))
+        }
+    
     def assess_content_quality(self, reel_data: Dict) -> Dict:
-        """Claude-powered quality review and assessment"""
+        """Claude-powered quality review and assessment
+        
+        A score at or above early_exit_threshold ends the stream after the scores: the
+        result then has early_exit=True, no recommendations and a placeholder analysis.
+        """
         if not self.claude:
-            print("⚠️  Claude API not available - using basic quality assessment")
+            logger.warning("⚠️  Claude API not available - using basic quality assessment")
             return self._fallback_quality_assessment(reel_data)
         
         try:
             # Build quality assessment prompt
             assessment_prompt = self._build_quality_assessment_prompt(reel_data)
             
-            # Call Claude API for quality assessment
-            response = self.claude.messages.create(
-                model="claude-3-5-sonnet-20241022",
-                max_tokens=3000,
-                temperature=0.2,
-                messages=[
-                    {
-                        "role": "user",
-                        "content": assessment_prompt
-                    }
-                ]
-            )
+            for model in (self.ASSESS_MODEL, self.REFINE_MODEL):
+                params = self._message_params(model, _QUALITY_SYSTEM, assessment_prompt, max_tokens=self.ASSESS_MAX_TOKENS,
+                                              temperature=0.2, tool=_QUALITY_TOOL)
+                cache_key = response_cache_key(params)
+                claude_response = self.response_cache.get(cache_key)
+                quality_data = None
+                
+                if claude_response is None:
+                    claude_response, quality_data = self._stream_assessment(params)
+                    if quality_data is None:
+                        self.response_cache.set(cache_key, claude_response)  # Only complete answers are cached
+                
+                if quality_data is None:
+                    quality_data = _extract_json_object(claude_response)
+                if quality_data is not None or model == self.REFINE_MODEL:
+                    break
+                logger.warning("⚠️  %s assessment had no JSON scores; retrying with %s", model, self.REFINE_MODEL)
             
-            # Parse quality assessment response
-            claude_response = response.content[0].text
-            quality_data = self._parse_quality_assessment_response(claude_response)
+            if quality_data is None:
+                quality_data = self._parse_quality_assessment_response(claude_response)
             
-            return {
-                'status': 'success',
-                'technical_quality': quality_data.get('technical_quality', 0.7),
-                'content_quality': quality_data.get('content_quality', 0.7),
-                'brand_alignment': quality_data.get('brand_alignment', 0.7),
-                'platform_optimization': quality_data.get('platform_optimization', 0.7),
-                'engagement_potential': quality_data.get('engagement_potential', 0.7),
-                'overall_score': quality_data.get('overall_score', 0.7),
-                'detailed_analysis': quality_data.get('analysis', ''),
-                'recommendations': quality_data.get('recommendations', []),
-                'pass_threshold': quality_data.get('overall_score', 0.7) >= 0.75,
-                'reloop_required': quality_data.get('overall_score', 0.7) < 0.75
-            }
+            return self._build_quality_result(quality_data)
             
         except Exception as e:
-            print(f"❌ Error in quality assessment: {e}")
+            logger.error("❌ Error in quality assessment: %s", e)
             return self._fallback_quality_assessment(reel_data)
     
+    def _stream_assessment(self, params: Dict):
+        """Stream an assessment, returning (text, early-exit scores or None)
+        
+        The scores come first, so a clear pass stops before Claude writes the analysis
+        and recommendations nobody will read.
+        """
+        for _ in range(2):
+            claude_response = ''
+            with self.claude.messages.stream(**params, timeout=_CLAUDE_TIMEOUT) as stream:
+                for event in stream:
+                    # Tool input streams as partial JSON; a plain text answer streams as text
+                    if event.type == 'input_json':
+                        claude_response += event.partial_json
+                    elif event.type == 'text':
+                        claude_response += event.text
+                    else:
+                        continue
+                    if '"overall_score"' in claude_response:
+                        quality_data = self._early_exit_scores(claude_response)
+                        if quality_data is not None:
+                            return claude_response, quality_data
+                stop_reason = stream.get_final_message().stop_reason
+            if stop_reason != 'max_tokens':
+                break
+            params = self._double_budget(params)
+        return claude_response, None
+    
+    def _build_quality_result(self, quality_data: Dict) -> Dict:
+        """Shape parsed assessment scores into the quality report"""
+        return {
+            'status': 'success',
+            'technical_quality': quality_data.get('technical_quality', 0.7),
+            'content_quality': quality_data.get('content_quality', 0.7),
+            'brand_alignment': quality_data.get('brand_alignment', 0.7),
+            'platform_optimization': quality_data.get('platform_optimization', 0.7),
+            'engagement_potential': quality_data.get('engagement_potential', 0.7),
+            'overall_score': quality_data.get('overall_score', 0.7),
+            'detailed_analysis': quality_data.get('analysis', ''),
+            'recommendations': quality_data.get('recommendations', []),
+            'pass_threshold': quality_data.get('overall_score', 0.7) >= 0.75,
+            'reloop_required': quality_data.get('overall_score', 0.7) < 0.75,
+            'early_exit': quality_data.get('early_exit', False)
+        }
+    
     def suggest_improvements(self, quality_report: Dict, storyboard_data: Dict) -> List[str]:
         """Generate specific improvement recommendations based on quality issues"""
         if not self.claude:
@@ -121,33 +498,73 @@ class ClaudeRefinementService:
             improvement_prompt = self._build_improvement_prompt(quality_report, storyboard_data)
             
             # Call Claude API for improvement suggestions
-            response = self.claude.messages.create(
-                model="claude-3-5-sonnet-20241022",
-                max_tokens=2000,
-                temperature=0.4,
-                messages=[
-                    {
-                        "role": "user",
-                        "content": improvement_prompt
-                    }
-                ]
-            )
-            
-            # Parse improvement suggestions
-            claude_response = response.content[0].text
-            suggestions = self._parse_improvement_suggestions(claude_response)
+            for model in (self.IMPROVE_MODEL, self.REFINE_MODEL):
+                claude_response = self._stream_text(model, _IMPROVEMENT_SYSTEM, improvement_prompt, max_tokens=self.IMPROVE_MAX_TOKENS, temperature=0.4)
+                
+                # Parse improvement suggestions (a lone entry holding the whole answer means no list was found)
+                suggestions = self._parse_improvement_suggestions(claude_response)
+                if suggestions != [claude_response] or model == self.REFINE_MODEL:
+                    break
+                logger.warning("⚠️  %s suggestions were not a list; retrying with %s", model, self.REFINE_MODEL)
             
             return suggestions
             
         except Exception as e:
-            print(f"❌ Error generating improvements: {e}")
+            logger.error("❌ Error generating improvements: %s", e)
             return self._fallback_improvement_suggestions(quality_report)
     
-    def _build_claude_refinement_prompt(self, scenes: List[Dict], visual_style: Dict, content_analysis: Dict, context: Dict) -> str:
-        """Build comprehensive prompt for Claude refinement"""
+    @staticmethod
+    def _message_params(model: str, system: str, prompt: str, max_tokens: int, temperature: float,
+                        tool: Optional[Dict] = None) -> Dict:
+        """Arguments for a single-turn request
+        
+        The static system prompt is marked for prompt caching so repeated calls only pay
+        full price for the reel-specific user turn. With a tool, Claude is made to answer
+        by calling it, so the answer is schema-shaped JSON.
+        """
+        params = {
+            'model': model,
+            'max_tokens': max_tokens,
+            'temperature': temperature,
+            'system': [{'type': 'text', 'text': system, 'cache_control': {'type': 'ephemeral'}}],
+            'messages': [
+                {
+                    "role": "user",
+                    "content": prompt
+                }
+            ]
+        }
+        if tool is not None:
+            params['tools'] = [tool]
+            params['tool_choice'] = {'type': 'tool', 'name': tool['name']}
+        return params
+    
+    def _stream_text(self, model: str, system: str, prompt: str, max_tokens: int, temperature: float) -> str:
+        """Stream a single-turn completion and return its full text (served from the response cache when possible)"""
+        params = self._message_params(model, system, prompt, max_tokens=max_tokens, temperature=temperature)
+        cache_key = response_cache_key(params)
+        text = self.response_cache.get(cache_key)
+        if text is None:
+            for _ in range(2):
+                with self.claude.messages.stream(**params, timeout=_CLAUDE_TIMEOUT) as stream:
+                    text = ''.join(stream.text_stream)
+                    stop_reason = stream.get_final_message().stop_reason
+                if stop_reason != 'max_tokens':
+                    break
+                params = self._double_budget(params)
+            if stop_reason != 'max_tokens':
+                self.response_cache.set(cache_key, text)  # Only complete answers are cached
+        return text
+    
+    @staticmethod
+    def _double_budget(params: Dict) -> Dict:
+        """Request arguments for retrying an answer that was cut off at max_tokens"""
+        logger.warning("⚠️  Claude answer hit max_tokens=%s; retrying with %s", params['max_tokens'], params['max_tokens'] * 2)
+        return {**params, 'max_tokens': params['max_tokens'] * 2}
+    
+    def _build_claude_refinement_prompt(self, scene: Dict, visual_style: Dict, content_analysis: Dict, context: Dict) -> str:
+        """Build the per-scene part of the refinement request (instructions live in _REFINEMENT_SYSTEM)"""
         return f"""
-You are an expert AI video generation prompt engineer. Your task is to refine and optimize video generation prompts for maximum quality and engagement.
-
 CONTEXT:
 - Platform: {context.get('platform', 'instagram')}
 - Duration: {context.get('duration', '20')}s
@@ -160,253 +577,51 @@ VISUAL STYLE:
 - Aesthetic: {visual_style.get('aesthetic_mood', 'modern')}
 - Engagement Hooks: {visual_style.get('engagement_hooks', 'dynamic')}
 
-ORIGINAL SCENES:
-{json.dumps(scenes, indent=2)}
-
-TASK: Refine each scene's description into professional video generation prompts optimized for AI models like Runway, Pika, or Hailuo.
-
-CRITICAL: All videos MUST be in VERTICAL 9:16 format for social media reels (1080x1920 resolution).
-
-FOR EACH SCENE, PROVIDE:
-1. **Enhanced Prompt**: Professional, detailed description with VERTICAL format specifications and "9:16 aspect ratio" explicitly mentioned
-2. **Quality Score**: Predicted success rate (0.0-1.0)
-3. **Model Recommendations**: Best AI model for this specific prompt
-4. **Technical Parameters**: Resolution (1080x1920), duration, style parameters, vertical format
-5. **Alternative Versions**: 2-3 variations for fallback options
-
-OUTPUT FORMAT (JSON):
-{{
-    "refined_prompts": [
-        {{
-            "scene_number": 1,
-            "original_description": "...",
-            "enhanced_prompt": "Professional vertical video prompt, 9:16 aspect ratio, 1080x1920 resolution, with technical details...",
-            "quality_prediction": 0.85,
-            "recommended_model": "hailuo-02",
-            "technical_params": {{
-                "resolution": "1080x1920",
-                "duration": 7,
-                "style": "cinematic",
-                "camera_movement": "smooth_pan"
-            }},
-            "alternative_prompts": ["Alt 1...", "Alt 2..."]
-        }}
-    ],
-    "quality_predictions": {{
-        "overall_score": 0.82,
-        "technical_feasibility": 0.85,
-        "creative_appeal": 0.80,
-        "engagement_potential": 0.85
-    }},
-    "model_optimizations": {{
-        "primary_model": "hailuo-02",
-        "fallback_models": ["runway-gen3", "pika-labs"],
-        "model_specific_tips": []
-    }},
-    "analysis": "Detailed analysis of prompt improvements...",
-    "improvements": ["Improvement 1", "Improvement 2"]
-}}
-
-Focus on creating prompts that will generate visually stunning, engaging video content optimized for social media success.
+ORIGINAL SCENE:
+{compact_json_dumps(_slim_scene(scene))}
 """
     
     def _build_quality_assessment_prompt(self, reel_data: Dict) -> str:
-        """Build prompt for Claude quality assessment"""
+        """Build the per-reel part of the assessment request (instructions live in _QUALITY_SYSTEM)"""
         return f"""
-You are an expert video content quality assessor specializing in social media reels. Analyze the provided reel data and provide comprehensive quality scores.
-
 REEL DATA:
-{json.dumps(reel_data, indent=2)}
-
-ASSESSMENT CRITERIA:
-1. **Technical Quality** (0.0-1.0): Resolution, sync, compression, format compliance
-2. **Content Quality** (0.0-1.0): Narrative flow, visual appeal, pacing
-3. **Brand Alignment** (0.0-1.0): Consistency with brand voice and messaging
-4. **Platform Optimization** (0.0-1.0): Platform-specific requirements met
-5. **Engagement Potential** (0.0-1.0): Predicted audience engagement and retention
-
-QUALITY THRESHOLDS:
-- PASS: Overall score ≥ 0.75
-- RELOOP REQUIRED: Overall score < 0.75
-
-OUTPUT FORMAT (JSON):
-{{
-    "technical_quality": 0.85,
-    "content_quality": 0.80,
-    "brand_alignment": 0.90,
-    "platform_optimization": 0.85,
-    "engagement_potential": 0.75,
-    "overall_score": 0.83,
-    "analysis": "Detailed quality analysis...",
-    "recommendations": ["Specific improvement 1", "Specific improvement 2"]
-}}
-
-Provide detailed analysis and actionable recommendations for improvement.
+{compact_json_dumps(_slim_reel(reel_data))}
 """
     
     def _build_improvement_prompt(self, quality_report: Dict, storyboard_data: Dict) -> str:
-        """Build prompt for improvement suggestions"""
+        """Build the per-reel part of the improvement request (instructions live in _IMPROVEMENT_SYSTEM)"""
         return f"""
-You are an expert video improvement consultant. Based on the quality assessment, provide specific, actionable improvement recommendations.
-
 QUALITY REPORT:
-{json.dumps(quality_report, indent=2)}
+{compact_json_dumps(_slim_quality(quality_report))}
 
 ORIGINAL STORYBOARD:
-{json.dumps(storyboard_data, indent=2)}
-
-PROVIDE:
-1. **Priority Issues**: Most critical problems to address
-2. **Specific Actions**: Concrete steps to improve each quality dimension
-3. **Reloop Strategy**: Recommended approach for regeneration
-4. **Success Metrics**: How to measure improvement
-
-OUTPUT: List of specific, actionable improvement recommendations.
+{compact_json_dumps(_slim_storyboard(storyboard_data))}
 """
     
     def _parse_claude_refinement_response(self, response: str) -> Dict:
-        """Parse Claude's refinement response into structured data"""
-        try:
-            # First try to extract JSON from response
-            json_match = re.search(r'\{.*\}', response, re.DOTALL)
-            if json_match:
-                return json.loads(json_match.group())
-            
-            # If no JSON found, parse the text format
-            return self._parse_claude_text_response(response)
-            
-        except json.JSONDecodeError:
-            # Fallback to text parsing
-            return self._parse_claude_text_response(response)
+        """Parse Claude's refinement answer (the emit_refined_prompt tool input) into structured data"""
+        refined_data = _extract_json_object(response)
+        if refined_data is None:
+            raise ValueError("refinement answer is not JSON")  # The scene falls back on its own
+        return refined_data
     
-    def _parse_claude_text_response(self, response: str) -> Dict:
-        """Parse Claude's text response into structured JSON format"""
-        refined_prompts = []
-        scene_number = 1
-        
-        try:
-            # Extract scenes using regex patterns
-            scene_pattern = r'Scene\s+(\d+):\s*\n?-?\s*Enhanced Prompt:\s*["\']?([^"\'\n]*(?:\n[^-\n]+)*?)["\']?\s*\n?\s*-?\s*Quality Prediction:\s*([0-9.]+)\s*\n?\s*-?\s*Recommended Model:\s*([a-zA-Z0-9-]+)'
-            
-            scenes = re.findall(scene_pattern, response, re.DOTALL | re.IGNORECASE)
-            
-            for scene_match in scenes:
-                scene_num = int(scene_match[0]) if scene_match[0].isdigit() else scene_number
-                enhanced_prompt = scene_match[1].strip()
-                quality_pred = float(scene_match[2]) if scene_match[2] else 0.75
-                recommended_model = scene_match[3].strip().lower()
-                
-                # Extract technical parameters if present
-                tech_params_pattern = r'Technical Parameters:\s*\{([^}]+)\}'
-                tech_match = re.search(tech_params_pattern, response)
-                tech_params = {
-                    'resolution': '1080x1920',
-                    'duration': 7 if scene_number == 1 else 8,
-                    'style': 'cinematic',
-                    'fps': 30
-                }
-                
-                if tech_match:
-                    try:
-                        # Try to parse the technical parameters
-                        tech_content = tech_match.group(1)
-                        tech_pairs = re.findall(r'"([^"]+)":\s*"?([^",}]+)"?', tech_content)
-                        for key, value in tech_pairs:
-                            tech_params[key] = int(value) if value.isdigit() else value.strip('"')
-                    except:
-                        pass
-                
-                refined_prompts.append({
-                    'scene_number': scene_num,
-                    'original_description': f'Scene {scene_num} description',
-                    'enhanced_prompt': enhanced_prompt,
-                    'quality_prediction': quality_pred,
-                    'recommended_model': recommended_model,
-                    'technical_params': tech_params,
-                    'alternative_prompts': []
-                })
-                
-                scene_number += 1
-            
-            # If no scenes found, create a basic fallback
-            if not refined_prompts:
-                # Try to extract any quoted prompts from the response
-                prompt_matches = re.findall(r'"([^"]{50,})"', response)
-                for i, prompt in enumerate(prompt_matches[:2]):  # Max 2 scenes
-                    refined_prompts.append({
-                        'scene_number': i + 1,
-                        'original_description': f'Scene {i + 1} extracted from response',
-                        'enhanced_prompt': prompt,
-                        'quality_prediction': 0.75,
-                        'recommended_model': 'hailuo-02' if i == 0 else 'runway-gen3',
-                        'technical_params': {
-                            'resolution': '1080x1920',
-                            'duration': 7 if i == 0 else 8,
-                            'style': 'cinematic',
-                            'fps': 30
-                        },
-                        'alternative_prompts': []
-                    })
-            
-            # Extract overall quality score
-            overall_score_match = re.search(r'overall.*?quality.*?score.*?([0-9.]+)', response, re.IGNORECASE)
-            if overall_score_match:
-                score_str = overall_score_match.group(1).rstrip('.')
-                try:
-                    overall_score = float(score_str)
-                except ValueError:
-                    overall_score = 0.8
-            else:
-                overall_score = 0.8
-            
-            return {
-                'refined_prompts': refined_prompts,
-                'quality_predictions': {'overall_score': overall_score},
-                'analysis': response,
-                'improvements': []
-            }
-            
-        except Exception as e:
-            print(f"⚠️  Error parsing Claude text response: {e}")
-            # Final fallback - create basic prompts
-            return {
-                'refined_prompts': [{
-                    'scene_number': 1,
-                    'original_description': 'Basic scene',
-                    'enhanced_prompt': 'High-quality cinematic video with professional lighting and composition',
-                    'quality_prediction': 0.75,
-                    'recommended_model': 'hailuo-02',
-                    'technical_params': {
-                        'resolution': '1080x1920',
-                        'duration': 10,
-                        'style': 'cinematic',
-                        'fps': 30
-                    },
-                    'alternative_prompts': []
-                }],
-                'quality_predictions': {'overall_score': 0.75},
-                'analysis': response,
-                'improvements': []
-            }
+    def _early_exit_scores(self, partial_response: str) -> Optional[Dict]:
+        """Scores from a partially streamed assessment, or None until overall_score clears the early-exit threshold"""
+        scores = {field: float(value) for field, value in _SCORE_FIELD.findall(partial_response)}
+        overall_score = scores.get('overall_score')
+        if overall_score is None or overall_score < self.early_exit_threshold:
+            return None
+        return {
+            **scores,
+            'analysis': f'Clear pass (overall score {overall_score:.2f}); detailed analysis skipped',
+            'recommendations': [],
+            'early_exit': True
+        }
     
     def _parse_quality_assessment_response(self, response: str) -> Dict:
         """Parse Claude's quality assessment response"""
-        try:
-            json_match = re.search(r'\{.*\}', response, re.DOTALL)
-            if json_match:
-                return json.loads(json_match.group())
-            else:
-                return {
-                    'technical_quality': 0.7,
-                    'content_quality': 0.7,
-                    'brand_alignment': 0.7,
-                    'platform_optimization': 0.7,
-                    'engagement_potential': 0.7,
-                    'overall_score': 0.7,
-                    'analysis': response,
-                    'recommendations': []
-                }
-        except json.JSONDecodeError:
+        quality_data = _extract_json_object(response)
+        if quality_data is None:
             return {
                 'technical_quality': 0.7,
                 'content_quality': 0.7,
@@ -417,17 +632,28 @@ OUTPUT: List of specific, actionable improvement recommendations.
                 'analysis': response,
                 'recommendations': []
             }
+        return quality_data
     
     def _parse_improvement_suggestions(self, response: str) -> List[str]:
         """Parse improvement suggestions from Claude response"""
         try:
+            # A JSON array of strings is already the list
+            stripped = response.strip()
+            if stripped.startswith('['):
+                try:
+                    parsed = fast_json_loads(stripped)
+                except ValueError:
+                    parsed = None
+                if isinstance(parsed, list) and parsed and all(isinstance(item, str) for item in parsed):
+                    return parsed
+            
             # Try to extract list from response
             lines = response.split('\n')
             suggestions = []
             for line in lines:
                 line = line.strip()
                 if line.startswith(('-', '•', '*')) or line[0:1].isdigit():
-                    suggestion = re.sub(r'^[-•*\d\.\s]+', '', line).strip()
+                    suggestion = _LIST_MARKER_RE.sub('', line).strip()
                     if suggestion:
                         suggestions.append(suggestion)
             return suggestions if suggestions else [response]
@@ -437,21 +663,7 @@ OUTPUT: List of specific, actionable improvement recommendations.
     def _fallback_prompt_refinement(self, storyboard_data: Dict) -> Dict:
         """Fallback refinement when Claude not available"""
         scenes = storyboard_data.get('storyboard', {}).get('scenes', [])
-        refined_prompts = []
-        
-        for scene in scenes:
-            refined_prompts.append({
-                'scene_number': scene.get('scene_number', 1),
-                'original_description': scene.get('description', ''),
-                'enhanced_prompt': f"High-quality cinematic {scene.get('description', '')}, professional lighting, vertical 9:16 aspect ratio, 1080x1920 resolution, mobile-optimized vertical video format",
-                'quality_prediction': 0.75,
-                'recommended_model': 'hailuo-02',
-                'technical_params': {
-                    'resolution': '1080x1920',
-                    'duration': scene.get('duration', 7),
-                    'style': 'cinematic'
-                }
-            })
+        refined_prompts = [self._fallback_scene_refinement(scene) for scene in scenes]
         
         return {
             'status': 'fallback',
@@ -460,6 +672,21 @@ OUTPUT: List of specific, actionable improvement recommendations.
             'analysis': 'Basic prompt enhancement applied (Claude not available)'
         }
     
+    def _fallback_scene_refinement(self, scene: Dict) -> Dict:
+        """Basic prompt enhancement for one scene (Claude unavailable or the scene's call failed)"""
+        return {
+            'scene_number': scene.get('scene_number', 1),
+            'original_description': scene.get('description', ''),
+            'enhanced_prompt': f"High-quality cinematic {scene.get('description', '')}, professional lighting, vertical 9:16 aspect ratio, 1080x1920 resolution, mobile-optimized vertical video format",
+            'quality_prediction': 0.75,
+            'recommended_model': 'hailuo-02',
+            'technical_params': {
+                'resolution': '1080x1920',
+                'duration': scene.get('duration', 7),
+                'style': 'cinematic'
+            }
+        }
+    
     def _fallback_quality_assessment(self, reel_data: Dict) -> Dict:
         """Fallback quality assessment when Claude not available"""
         return {
@@ -473,7 +700,8 @@ OUTPUT: List of specific, actionable improvement recommendations.
             'detailed_analysis': 'Basic quality assessment (Claude not available)',
             'recommendations': ['Enable Claude API for detailed quality assessment'],
             'pass_threshold': True,
-            'reloop_required': False
+            'reloop_required': False,
+            'early_exit': False
         }
     
     def _fallback_improvement_suggestions(self, quality_report: Dict) -> List[str]:
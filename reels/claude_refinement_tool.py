@@ -2,12 +2,19 @@
 Custom CrewAI tool for Claude prompt refinement
 """
 
+import asyncio
+from functools import lru_cache
 from crewai.tools.base_tool import BaseTool
-from typing import Type, Dict, Any
+from typing import Type, Dict
 from pydantic import BaseModel, Field
-import json
-import re
 from .claude_refinement import ClaudeRefinementService
+from .utils import fast_json_dumps
+
+
+@lru_cache(maxsize=1)
+def _claude_service() -> ClaudeRefinementService:
+    """One service for every tool run, so the response cache and Claude clients are set up once"""
+    return ClaudeRefinementService()
 
 
 class ClaudeRefinementInput(BaseModel):
@@ -44,8 +51,8 @@ class ClaudeRefinementTool(BaseTool):
                     'user_prompt': 'video reel'
                 }
             
-            # Initialize Claude refinement service
-            claude_service = ClaudeRefinementService()
+            # Shared Claude refinement service
+            claude_service = _claude_service()
             
             # Refine prompts using Claude AI
             refined_result = claude_service.refine_video_prompts(
@@ -54,7 +61,7 @@ class ClaudeRefinementTool(BaseTool):
             )
             
             # Return JSON string result
-            return json.dumps(refined_result, indent=2)
+            return fast_json_dumps(refined_result)
             
         except Exception as e:
             error_result = {
@@ -62,4 +69,8 @@ class ClaudeRefinementTool(BaseTool):
                 'error': str(e),
                 'message': 'Claude refinement failed, using fallback enhancement'
             }
-            return json.dumps(error_result, indent=2)
\ No newline at end of file
+            return fast_json_dumps(error_result)
+    
+    async def _arun(self, storyboard_data: Dict, context: Dict) -> str:
+        """Async refinement so crews kicked off concurrently overlap their Claude calls"""
+        return await asyncio.to_thread(self._run, storyboard_data, context)
\ No newline at end of file
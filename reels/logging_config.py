@@ -0,0 +1,60 @@
+"""
+Queue-backed logging for reel generation
+Records are handed to a background listener thread so worker threads never block on stdout
+"""
+
+import atexit
+import logging
+import logging.handlers
+import queue
+import sys
+import threading
+from typing import Optional
+
+from decouple import config
+
+
+_listener = None
+_configure_lock = threading.Lock()
+
+
+def configure_reel_logging(level: int = logging.INFO) -> None:
+    """Route every 'reels.*' logger through a QueueHandler drained by a single QueueListener"""
+    global _listener
+
+    with _configure_lock:
+        if _listener is not None:
+            return
+
+        log_queue = queue.SimpleQueue()
+
+        # Plain message format keeps console output identical to the previous print() calls
+        stream_handler = logging.StreamHandler(sys.stdout)
+        stream_handler.setFormatter(logging.Formatter('%(message)s'))
+
+        _listener = logging.handlers.QueueListener(log_queue, stream_handler)
+        _listener.start()
+        atexit.register(_listener.stop)
+
+        reels_logger = logging.getLogger('reels')
+        reels_logger.addHandler(logging.handlers.QueueHandler(log_queue))
+        reels_logger.setLevel(level)
+        reels_logger.propagate = False
+
+
+def get_logger(name: str, level_env: Optional[str] = None) -> logging.Logger:
+    """Return a logger under the 'reels' hierarchy, configuring the queue listener on first use
+
+    level_env names a setting (e.g. AUDIO_LOG_LEVEL, from the environment or .env) that overrides this logger's level;
+    an invalid value is ignored with a warning.
+    """
+    configure_reel_logging()
+    logger = logging.getLogger(name)
+    level = config(level_env, default='') if level_env else None
+    if level:
+        try:
+            logger.setLevel(level.upper())
+        except ValueError:
+            # A typo in the environment must not make the module fail to import
+            logger.warning("⚠️  Ignoring %s=%r: not a logging level", level_env, level)
+    return logger
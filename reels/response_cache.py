@@ -0,0 +1,111 @@
+"""
+Content-addressed cache for Claude answers so re-running a reel with unchanged inputs skips the API
+"""
+
+import hashlib
+import json
+import os
+import threading
+import time
+from typing import Dict, Optional
+
+from .logging_config import get_logger
+from .utils import env_setting
+
+logger = get_logger(__name__)
+
+
+RESPONSE_CACHE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), '.response_cache')
+
+# Entries expire this long after creation; past the size cap the least recently used go first
+RESPONSE_CACHE_TTL = env_setting('CLAUDE_CACHE_TTL', default=7 * 24 * 3600.0, cast=float)
+RESPONSE_CACHE_MAX_ENTRIES = env_setting('CLAUDE_CACHE_MAX_ENTRIES', default=2000, cast=int)
+
+
+def response_cache_key(request_params: Dict) -> str:
+    """Build the cache key for a Claude request from the exact arguments sent to the API"""
+    # Editing one scene only changes that scene's request, so the other scenes still hit
+    return hashlib.blake2b(json.dumps(request_params, sort_keys=True).encode('utf-8'), digest_size=16).hexdigest()
+
+
+class ResponseCache:
+    """On-disk cache: one <key>.txt per answer holding Claude's raw text
+
+    Like the audio cache, a file's mtime is its creation time (for the TTL) and its
+    atime is bumped on every hit (for LRU eviction). CLAUDE_CACHE=0 disables it.
+    """
+
+    _evict_lock = threading.Lock()
+
+    def __init__(self, cache_dir: str = RESPONSE_CACHE_DIR, ttl: float = RESPONSE_CACHE_TTL,
+                 max_entries: int = RESPONSE_CACHE_MAX_ENTRIES):
+        self.cache_dir = cache_dir
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self.enabled = env_setting('CLAUDE_CACHE', default=True, cast=bool)
+
+    def get(self, key: str) -> Optional[str]:
+        """Return the cached answer for a key, or None on a miss or an expired entry"""
+        if not self.enabled:
+            return None
+
+        cached_path = os.path.join(self.cache_dir, f"{key}.txt")
+        try:
+            st = os.stat(cached_path)
+            now = time.time()
+            if now - st.st_mtime > self.ttl:
+                return None
+            with open(cached_path, encoding='utf-8') as f:
+                text = f.read()
+            os.utime(cached_path, (now, st.st_mtime))
+        except OSError:
+            return None
+
+        logger.info("♻️  Claude response cache hit: %s", key)
+        return text
+
+    def set(self, key: str, text: str) -> None:
+        """Store a complete answer, evicting expired and excess entries"""
+        if not self.enabled:
+            return
+
+        try:
+            os.makedirs(self.cache_dir, exist_ok=True)
+            cached_path = os.path.join(self.cache_dir, f"{key}.txt")
+            tmp_path = f"{cached_path}.{os.getpid()}.{threading.get_ident()}.tmp"
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                f.write(text)
+            os.replace(tmp_path, cached_path)
+            with self._evict_lock:
+                self._evict()
+        except OSError as e:
+            logger.warning("⚠️  Claude response cache store failed: %s", e)
+
+    def _evict(self) -> None:
+        """Delete expired entries, then the least recently used ones beyond max_entries"""
+        now = time.time()
+        entries = []
+        evicted = []
+
+        with os.scandir(self.cache_dir) as it:
+            for entry in it:
+                if not entry.name.endswith('.txt'):
+                    continue
+                try:
+                    st = entry.stat()
+                except OSError:
+                    continue
+                if now - st.st_mtime > self.ttl:
+                    evicted.append(entry.path)
+                else:
+                    entries.append((st.st_atime, entry.path))
+
+        if len(entries) > self.max_entries:
+            entries.sort()
+            evicted.extend(path for _, path in entries[:len(entries) - self.max_entries])
+
+        for path in evicted:
+            try:
+                os.remove(path)
+            except OSError:
+                pass
@@ -0,0 +1,90 @@
+"""
+Micro-batching for FAL.AI TTS requests issued by concurrent reels
+"""
+
+import json
+import threading
+from concurrent.futures import Future
+from typing import Any, Dict, List, Tuple
+
+from .logging_config import get_logger
+
+logger = get_logger(__name__, 'AUDIO_LOG_LEVEL')
+
+
+class TTSBatcher:
+    """Coalesce TTS requests that arrive within a short window into one submission round
+
+    The F5 TTS endpoint takes a single text per request, so a flush submits every
+    queued job back-to-back (identical requests share one job) and only then waits
+    on the results, letting FAL queue the whole batch at once.
+    """
+
+    def __init__(self, window: float = 0.05, max_batch: int = 8):
+        self.window = window
+        self.max_batch = max_batch
+        self._pending: List[Tuple[str, Dict[str, Any], Future]] = []
+        self._lock = threading.Lock()
+        self._timer = None
+
+    def request(self, endpoint: str, arguments: Dict[str, Any], timeout: float) -> Dict[str, Any]:
+        """Queue a TTS request and block until its batch has been resolved"""
+        future = Future()
+
+        with self._lock:
+            self._pending.append((endpoint, arguments, future))
+            if len(self._pending) >= self.max_batch:
+                batch = self._take_pending()
+            else:
+                batch = None
+                if self._timer is None:
+                    self._timer = threading.Timer(self.window, self._flush_pending)
+                    self._timer.daemon = True
+                    self._timer.start()
+
+        if batch:
+            self._flush(batch)
+
+        return future.result(timeout)
+
+    def _take_pending(self) -> List[Tuple[str, Dict[str, Any], Future]]:
+        """Detach the queued batch (caller holds the lock)"""
+        batch, self._pending = self._pending, []
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        return batch
+
+    def _flush_pending(self):
+        """Timer callback: flush whatever accumulated during the window"""
+        with self._lock:
+            batch = self._take_pending()
+        if batch:
+            self._flush(batch)
+
+    def _flush(self, batch: List[Tuple[str, Dict[str, Any], Future]]):
+        """Submit every unique job in the batch, then resolve each caller's future"""
+        import fal_client  # Deferred so importing the batcher stays cheap
+
+        jobs = {}
+        for endpoint, arguments, future in batch:
+            key = (endpoint, json.dumps(arguments, sort_keys=True))
+            if key not in jobs:
+                try:
+                    jobs[key] = (fal_client.submit(endpoint, arguments=arguments), [])
+                except Exception as e:
+                    future.set_exception(e)
+                    continue
+            jobs[key][1].append(future)
+
+        logger.info("   📦 TTS batch: %s request(s), %s FAL job(s)", len(batch), len(jobs))
+
+        for handle, futures in jobs.values():
+            try:
+                final_result = handle.get()
+            except Exception as e:
+                for future in futures:
+                    future.set_exception(e)
+                continue
+            for future in futures:
+                future.set_result(final_result)
@@ -6,7 +6,76 @@ import os
 import re
 import json
 from datetime import datetime
-from typing import Dict, Any
+from types import MappingProxyType
+from typing import Dict, Any, Callable, Union
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+
+def env_setting(name: str, default: Any, cast: Callable = str) -> Any:
+    """Read an optional setting from the environment, then .env (via decouple)
+
+    A malformed value is ignored with a warning instead of failing the caller.
+    """
+    from decouple import config
+
+    try:
+        return config(name, default=default, cast=cast)
+    except ValueError:
+        from .logging_config import get_logger
+        get_logger(__name__).warning("⚠️  Ignoring %s: not a valid %s, using %r", name, cast.__name__, default)
+        return default
+
+
+def fast_json_loads(data: Union[str, bytes]) -> Any:
+    """Parse JSON with orjson when it is installed, otherwise with the stdlib parser"""
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+def _json_default(obj: Any) -> Any:
+    """Encode result objects (anything with to_dict()) and read-only mappings without converting them up front"""
+    to_dict = getattr(obj, 'to_dict', None)
+    if to_dict is not None:
+        return to_dict()
+    if isinstance(obj, MappingProxyType):
+        return dict(obj)
+    raise TypeError(f"Object of type {type(obj).__name__} is not JSON serializable")
+
+
+def fast_json_dumps(data: Any) -> str:
+    """Serialize tool results as compact JSON; set REELS_DEBUG for indented output
+
+    Result dataclasses can be passed as they are: their to_dict() decides the JSON shape.
+    """
+    if env_setting('REELS_DEBUG', default=''):
+        return json.dumps(data, indent=2, default=_json_default)
+    if orjson is not None:
+        try:
+            # Passthrough so dataclasses go through to_dict() rather than orjson's all-fields encoding
+            return orjson.dumps(data, default=_json_default, option=orjson.OPT_PASSTHROUGH_DATACLASS).decode('utf-8')
+        except TypeError:
+            pass  # Types orjson does not handle fall back to the stdlib encoder
+    return json.dumps(data, separators=(',', ':'), default=_json_default)
+
+
+def compact_json_dumps(data: Any) -> str:
+    """Serialize data as compact UTF-8 JSON regardless of REELS_DEBUG
+
+    For text whose bytes must not depend on the environment, such as Claude prompts,
+    which also key the response cache.
+    """
+    if orjson is not None:
+        try:
+            return orjson.dumps(data, default=_json_default, option=orjson.OPT_PASSTHROUGH_DATACLASS).decode('utf-8')
+        except TypeError:
+            pass  # Types orjson does not handle fall back to the stdlib encoder
+    # ensure_ascii=False matches orjson's output, so the text is the same with or without it installed
+    return json.dumps(data, separators=(',', ':'), ensure_ascii=False, default=_json_default)
 
 
 def parse_duration(duration_str: str) -> int:
@@ -7,7 +7,6 @@ import asyncio
 import requests
 from typing import List, Dict, Any, Optional
 import fal_client
-from decouple import config
 import time
 import json
 
@@ -22,12 +21,8 @@ class VideoGenerator:
     def __init__(self, output_folder: str):
         self.output_folder = output_folder
         
-        # Load FAL_KEY with multiple fallbacks
-        self.fal_key = config('FAL_KEY', default='')
-        if not self.fal_key:
-            self.fal_key = os.getenv('FAL_KEY', '')
-        if not self.fal_key:
-            self.fal_key = os.environ.get('FAL_KEY', '')
+        # .env was loaded into the environment at import, so one lookup covers every source
+        self.fal_key = os.environ.get('FAL_KEY', '')
             
         print(f"🔑 FAL_KEY status: {'✅ Found' if self.fal_key else '❌ Missing'}")
         if self.fal_key:
@@ -436,10 +431,10 @@ class VideoGenerator:
         clip_filename = f"mock_clip_{clip_id}_{model_name}.mp4"
         clip_path = os.path.join(self.clips_folder, clip_filename)
         
-        # Create realistic mock file (1MB video-like size)
-        mock_video_content = b'\\x00' * 1048576  # 1MB of null bytes
+        # Create realistic mock file (1MB video-like size): extending the empty file
+        # zero-fills it (sparse where supported) without building or writing a buffer
         with open(clip_path, 'wb') as f:
-            f.write(mock_video_content)
+            os.ftruncate(f.fileno(), 1048576)
         
         duration = prompt_data.get('technical_params', {}).get('duration', 7)
         
@@ -493,10 +488,9 @@ class VideoGenerator:
             clip_filename = f"mock_clip_{i + 1}.mp4"
             clip_path = os.path.join(self.clips_folder, clip_filename)
             
-            # Create realistic mock file (small video-like size)
-            mock_video_content = b'\x00' * 1048576  # 1MB of null bytes
+            # Create realistic mock file (1MB of zeros, sparse where supported)
             with open(clip_path, 'wb') as f:
-                f.write(mock_video_content)
+                os.ftruncate(f.fileno(), 1048576)
             
             mock_clips.append({
                 'clip_id': i + 1,
@@ -0,0 +1,300 @@
+#!/usr/bin/env python3
+"""
+Tests for the on-disk audio cache and its single-flight generation lock
+Runs without API keys: FAL calls are replaced on the generator instance
+"""
+
+import io
+import json
+import os
+import sys
+import tempfile
+import threading
+import time
+
+# Add project root to Python path
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+
+def test_single_flight_generation():
+    """Two threads narrating the same script pay for one TTS job"""
+    print("🧪 Testing single-flight TTS generation...")
+
+    from reels.audio_cache import AudioCache
+    from reels.audio_generator import AudioGenerator
+
+    with tempfile.TemporaryDirectory() as tmp:
+        generator = AudioGenerator(tmp)
+        generator.fal_key = 'test-key'
+        generator.audio_cache = AudioCache(os.path.join(tmp, 'cache'))
+
+        calls = []
+
+        def fake_tts(script, voice_style, target_duration):
+            calls.append(script)
+            time.sleep(0.3)  # Keep the second thread waiting on the lock
+            return {'status': 'success', 'audio_url': 'http://fal.test/audio.wav'}
+
+        generator._execute_f5_tts_generation = fake_tts
+        generator._fetch_audio_buffer = lambda url: io.BytesIO(b'RIFF\x00\x00\x00\x00WAVEfmt ')
+
+        video_data = {'total_duration': 10, 'generated_clips': []}
+        context = {'user_prompt': 'morning fitness routine', 'audio_theme': 'professional'}
+        results = [None, None]
+
+        def narrate(index):
+            results[index] = generator._generate_narration_audio(video_data, context)
+
+        threads = [threading.Thread(target=narrate, args=(i,)) for i in range(2)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        assert len(calls) == 1, f"Expected one TTS job, got {len(calls)}"
+        assert all(r['tts_result']['status'] == 'cache_hit' for r in results), results
+        assert sorted(r['cost_estimate'] > 0 for r in results) == [False, True], results
+        print("✅ Only one thread generated; the other reused its cached audio")
+
+
+def test_lock_times_out():
+    """A held key lock makes a second worker give up after its timeout"""
+    print("\n🧪 Testing audio cache lock timeout...")
+
+    from reels.audio_cache import AudioCache
+
+    with tempfile.TemporaryDirectory() as tmp:
+        cache = AudioCache(tmp)
+        with cache.lock('key'):
+            errors = []
+
+            def wait_for_lock():
+                try:
+                    cache.lock('key', timeout=0.2)
+                except TimeoutError as e:
+                    errors.append(e)
+
+            waiter = threading.Thread(target=wait_for_lock)
+            waiter.start()
+            waiter.join()
+            assert len(errors) == 1, "Second lock should have timed out"
+
+        # Released by the with block: the key can be locked again
+        cache.lock('key', timeout=0.2).release()
+        print("✅ Lock wait is bounded and the lock is released on exit")
+
+
+def test_cost_estimates_are_plain_dicts():
+    """get_cost_estimates returns a JSON-serializable copy that callers may modify"""
+    print("\n🧪 Testing AudioGenerator cost estimates...")
+
+    from reels.audio_generator import AudioGenerator
+
+    with tempfile.TemporaryDirectory() as tmp:
+        generator = AudioGenerator(tmp)
+        estimates = generator.get_cost_estimates()
+        json.dumps(estimates)
+        estimates['narration_mode']['estimated_cost'] = 99.0
+        assert generator.get_cost_estimates()['narration_mode']['estimated_cost'] != 99.0
+        print("✅ Cost estimates serialize and copies stay independent")
+
+
+def test_audio_content_is_a_plain_dict():
+    """generate_audio_content hands callers a JSON-serializable dict, also when generation fails"""
+    print("\n🧪 Testing the AudioGenerator result type...")
+
+    from reels.audio_generator import AudioGenerator
+
+    with tempfile.TemporaryDirectory() as tmp:
+        generator = AudioGenerator(tmp)
+        generator.fal_key = ''  # Mock mode: no FAL calls
+        video_data = {'total_duration': 5, 'generated_clips': []}
+
+        result = generator.generate_audio_content(video_data, 'music', {'audio_theme': 'upbeat'})
+        assert isinstance(result, dict)
+        assert result['audio_generation_status'] == 'mock'
+        json.dumps(result)
+
+        generator._extract_video_generation_data = lambda video_result: 1 / 0
+        failed = generator.generate_audio_content(video_data, 'music', {})
+        assert isinstance(failed, dict)
+        assert failed['audio_generation_status'] == 'failed' and 'division by zero' in failed['error']
+        print("✅ Successful and failed results are both plain dicts")
+
+
+def test_expired_entries_miss_and_are_evicted():
+    """Entries older than the TTL are misses and are removed on the next store"""
+    print("\n🧪 Testing audio cache expiry...")
+
+    from reels.audio_cache import AudioCache
+
+    with tempfile.TemporaryDirectory() as tmp:
+        cache = AudioCache(tmp, ttl=60)
+        cache.store_bytes('old', b'RIFF-old', {'voice_style': 'professional'})
+        assert cache.lookup('old') is not None
+
+        # Age the entry past its TTL (mtime records creation)
+        past = time.time() - 120
+        os.utime(os.path.join(tmp, 'old.wav'), (past, past))
+        assert cache.lookup('old') is None, "Expired entry should miss"
+
+        cache.store_bytes('new', b'RIFF-new', {'voice_style': 'professional'})
+        assert not os.path.exists(os.path.join(tmp, 'old.wav'))
+        with open(os.path.join(tmp, 'manifest.json')) as f:
+            assert sorted(json.load(f)) == ['new']
+        print("✅ Expired entry missed and was evicted from disk and manifest")
+
+
+def test_least_recently_used_evicted_first():
+    """Past max_entries the entry with the oldest hit goes first"""
+    print("\n🧪 Testing audio cache LRU eviction...")
+
+    from reels.audio_cache import AudioCache
+
+    with tempfile.TemporaryDirectory() as tmp:
+        cache = AudioCache(tmp, max_entries=2)
+        now = time.time()
+        for age, key in ((30, 'a'), (20, 'b')):
+            cache.store_bytes(key, f'RIFF-{key}'.encode(), {})
+            os.utime(os.path.join(tmp, f'{key}.wav'), (now - age, now - age))
+
+        # A hit on 'a' makes 'b' the least recently used
+        assert cache.lookup('a') is not None
+        cache.store_bytes('c', b'RIFF-c', {})
+
+        assert sorted(name for name in os.listdir(tmp) if name.endswith('.wav')) == ['a.wav', 'c.wav']
+        with open(os.path.join(tmp, 'manifest.json')) as f:
+            assert sorted(json.load(f)) == ['a', 'c']
+        print("✅ Least recently used entry evicted; manifest kept in step")
+
+
+def test_eviction_keeps_lock_files():
+    """Evicting an entry leaves its lock file for workers that may hold it"""
+    print("\n🧪 Testing that eviction keeps lock files...")
+
+    from reels.audio_cache import AudioCache
+
+    with tempfile.TemporaryDirectory() as tmp:
+        cache = AudioCache(tmp, max_entries=1)
+        with cache.lock('a'):
+            cache.store_bytes('a', b'RIFF-a', {})
+            past = time.time() - 60
+            os.utime(os.path.join(tmp, 'a.wav'), (past, past))
+            cache.store_bytes('b', b'RIFF-b', {})
+        assert not os.path.exists(os.path.join(tmp, 'a.wav'))
+        assert os.path.exists(os.path.join(tmp, 'a.lock'))
+        print("✅ Lock file survived eviction")
+
+
+def test_tts_batcher_flushes_and_dedupes():
+    """A full batch flushes at once, identical requests share one FAL job"""
+    print("\n🧪 Testing TTS micro-batching...")
+
+    import fal_client
+    from reels.tts_batcher import TTSBatcher
+
+    submitted = []
+
+    class Handle:
+        def __init__(self, arguments):
+            self.arguments = arguments
+
+        def get(self):
+            return {'audio': {'url': f"http://fal.test/{self.arguments['text']}.wav"}}
+
+    def fake_submit(endpoint, arguments):
+        submitted.append(arguments['text'])
+        return Handle(arguments)
+
+    original_submit = fal_client.submit
+    fal_client.submit = fake_submit
+    try:
+        # Long window: only reaching max_batch can trigger this flush
+        batcher = TTSBatcher(window=30, max_batch=3)
+        texts = ['hello', 'hello', 'world']
+        results = [None] * len(texts)
+
+        def request(index):
+            results[index] = batcher.request('fal-ai/f5-tts', {'text': texts[index]}, timeout=5)
+
+        threads = [threading.Thread(target=request, args=(i,)) for i in range(len(texts))]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        assert sorted(submitted) == ['hello', 'world'], submitted
+        assert [r['audio']['url'] for r in results] == [f"http://fal.test/{t}.wav" for t in texts]
+
+        # A lone request is flushed by the window timer
+        submitted.clear()
+        batcher = TTSBatcher(window=0.05, max_batch=8)
+        result = batcher.request('fal-ai/f5-tts', {'text': 'solo'}, timeout=5)
+        assert submitted == ['solo'] and result['audio']['url'] == 'http://fal.test/solo.wav'
+    finally:
+        fal_client.submit = original_submit
+    print("✅ Batches flush on size or window and share duplicate jobs")
+
+
+def test_invalid_log_level_is_ignored():
+    """A bad AUDIO_LOG_LEVEL leaves the logger usable instead of raising at import"""
+    print("\n🧪 Testing invalid AUDIO_LOG_LEVEL handling...")
+
+    import logging
+    from reels.logging_config import get_logger
+
+    previous = os.environ.get('AUDIO_LOG_LEVEL')
+    os.environ['AUDIO_LOG_LEVEL'] = 'verbose'
+    try:
+        logger = get_logger('reels.test_invalid_level', 'AUDIO_LOG_LEVEL')
+        assert logger.level == logging.NOTSET
+        os.environ['AUDIO_LOG_LEVEL'] = 'debug'
+        assert get_logger('reels.test_valid_level', 'AUDIO_LOG_LEVEL').level == logging.DEBUG
+    finally:
+        if previous is None:
+            os.environ.pop('AUDIO_LOG_LEVEL', None)
+        else:
+            os.environ['AUDIO_LOG_LEVEL'] = previous
+    print("✅ Invalid level ignored, valid level applied")
+
+
+def test_latest_reel_folder_sees_new_folders():
+    """A reel folder created right after a lookup is found by the next one"""
+    print("\n🧪 Testing newest reel folder lookup...")
+
+    from reels.audio_generation_tool import _resolve_output_folder
+
+    cwd = os.getcwd()
+    with tempfile.TemporaryDirectory() as tmp:
+        os.chdir(tmp)
+        try:
+            assert _resolve_output_folder({}) is None
+            os.makedirs(os.path.join('reels', 'reel_first'))
+            assert _resolve_output_folder({}).endswith('reel_first')
+            time.sleep(0.02)
+            os.makedirs(os.path.join('reels', 'reel_second'))
+            assert _resolve_output_folder({}).endswith('reel_second')
+        finally:
+            os.chdir(cwd)
+    print("✅ New reel folder picked up without a stale cache hit")
+
+
+def main():
+    """Run every test in this file and print a summary"""
+    tests = [obj for name, obj in globals().items() if name.startswith('test_') and callable(obj)]
+    failed = 0
+    for test in tests:
+        try:
+            test()
+        except Exception as e:
+            failed += 1
+            print(f"❌ {test.__name__} failed: {e!r}")
+
+    print("\n" + "=" * 50)
+    print(f"Passed: {len(tests) - failed}/{len(tests)}")
+    return failed == 0
+
+
+if __name__ == "__main__":
+    success = main()
+    sys.exit(0 if success else 1)
@@ -0,0 +1,168 @@
+#!/usr/bin/env python3
+"""
+Tests for narration post-processing: sentence-level TTS and the audio optimize paths
+Runs without API keys or ffmpeg: FAL calls and downloads are replaced on the generator instance
+"""
+
+import json
+import os
+import sys
+import tempfile
+
+import numpy as np
+import soundfile as sf
+
+# Add project root to Python path
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+
+def _write_tone(path, duration, sample_rate=22050, channels=1, amplitude=0.25):
+    """Write a 440Hz tone WAV of the given length"""
+    t = np.arange(int(duration * sample_rate)) / sample_rate
+    tone = (amplitude * np.sin(2 * np.pi * 440 * t)).astype(np.float32)
+    sf.write(path, np.column_stack([tone] * channels) if channels > 1 else tone, sample_rate, subtype='PCM_16')
+
+
+def _generator(tmp):
+    from reels.audio_cache import AudioCache
+    from reels.audio_generator import AudioGenerator
+
+    generator = AudioGenerator(tmp)
+    generator.fal_key = 'test-key'
+    generator.audio_cache = AudioCache(os.path.join(tmp, 'cache'))
+    return generator
+
+
+def test_sentence_tts_stitches_to_target_duration():
+    """Each sentence is synthesized with its share of the duration, stitched in order and fitted to the target"""
+    print("🧪 Testing sentence-level TTS...")
+
+    import reels.audio_generator as audio_generator
+
+    with tempfile.TemporaryDirectory() as tmp:
+        generator = _generator(tmp)
+        target_duration = 6.0
+        jobs = {}
+
+        async def fake_tts(tts_params, segment_duration):
+            url = f"http://fal.test/segment_{len(jobs)}.wav"
+            jobs[url] = (tts_params['text'], segment_duration)
+            return {'status': 'success', 'audio_url': url}
+
+        async def fake_download(audio_url, output_path):
+            # FAL returns each segment a little short, so the stitched narration needs padding
+            _write_tone(output_path, jobs[audio_url][1] * 0.8)
+
+        generator._submit_f5_tts_async = fake_tts
+        generator._download_audio_async = fake_download
+
+        original_sentence_tts = audio_generator._sentence_tts
+        audio_generator._sentence_tts = lambda: True
+        try:
+            result = generator.generate_audio_content(
+                {'generated_clips': [{'status': 'success', 'duration': 3.0}, {'status': 'success', 'duration': 3.0}]},
+                'narration',
+                {'user_prompt': 'morning workout tips', 'audio_theme': 'energetic'}
+            )
+        finally:
+            audio_generator._sentence_tts = original_sentence_tts
+
+        sentences = audio_generator._SENTENCE_SPLIT.split(result['script_content'].strip())
+        assert len(sentences) > 1, "Script should have several sentences"
+        assert [text for text, _ in jobs.values()] == sentences
+        durations = [duration for _, duration in jobs.values()]
+        assert abs(sum(durations) - target_duration) < 1e-6
+        for sentence, duration in zip(sentences, durations):
+            assert abs(duration - target_duration * len(sentence) / sum(map(len, sentences))) < 1e-6
+
+        audio = result['generated_audio']
+        assert audio['status'] == 'success', audio
+        info = sf.info(audio['file_path'])
+        assert (info.samplerate, info.channels, info.subtype) == (44100, 1, 'PCM_16')
+        assert abs(info.duration - target_duration) < 0.01, info.duration
+        assert not [name for name in os.listdir(generator.audio_folder) if name.startswith('segment_')]
+        print(f"✅ {len(sentences)} sentences stitched into {info.duration:.2f}s of 44.1kHz mono audio")
+
+
+def test_soundfile_optimize_path():
+    """soundfile resamples to 44.1kHz mono, normalizes the peak and fits the target duration"""
+    print("\n🧪 Testing the soundfile optimize path...")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        generator = _generator(tmp)
+        source_path = os.path.join(tmp, 'narration.wav')
+        _write_tone(source_path, 3.0, sample_rate=22050, channels=2, amplitude=0.25)
+
+        optimized_path = generator._optimize_audio_file(source_path, 2.0)
+
+        assert optimized_path == os.path.join(tmp, 'narration_optimized.wav')
+        data, sample_rate = sf.read(optimized_path)
+        assert sample_rate == 44100 and data.ndim == 1
+        assert len(data) == 2 * 44100
+        assert abs(np.max(np.abs(data)) - 0.98) < 0.01
+        assert generator._optimize_audio_file(optimized_path, 2.0) == optimized_path, "Optimized audio is left as is"
+        print("✅ Audio resampled, normalized and trimmed in one pass")
+
+
+def test_ffmpeg_optimize_path():
+    """Without soundfile a single ffmpeg pass normalizes, fits the duration and converts the format"""
+    print("\n🧪 Testing the ffmpeg optimize path...")
+
+    import reels.audio_generator as audio_generator
+
+    with tempfile.TemporaryDirectory() as tmp:
+        generator = _generator(tmp)
+        source_path = os.path.join(tmp, 'narration.wav')
+        _write_tone(source_path, 3.0)
+
+        # Stand-in ffmpeg: records its arguments and copies the input to the output path
+        args_path = os.path.join(tmp, 'ffmpeg_args.json')
+        fake_ffmpeg = os.path.join(tmp, 'ffmpeg')
+        with open(fake_ffmpeg, 'w') as f:
+            f.write(
+                f"#!{sys.executable}\n"
+                "import json, shutil, sys\n"
+                f"json.dump(sys.argv[1:], open({args_path!r}, 'w'))\n"
+                "shutil.copyfile(sys.argv[sys.argv.index('-i') + 1], sys.argv[-1])\n"
+            )
+        os.chmod(fake_ffmpeg, 0o755)
+
+        original_soundfile, original_ffmpeg = audio_generator._soundfile, audio_generator._ffmpeg
+        audio_generator._soundfile = lambda: (None, None)
+        audio_generator._ffmpeg = lambda: fake_ffmpeg
+        try:
+            optimized_path = generator._optimize_audio_file(source_path, 2.5)
+        finally:
+            audio_generator._soundfile, audio_generator._ffmpeg = original_soundfile, original_ffmpeg
+
+        assert optimized_path == os.path.join(tmp, 'narration_optimized.wav')
+        assert os.path.exists(optimized_path)
+        with open(args_path) as f:
+            args = json.load(f)
+        assert args[args.index('-i') + 1] == source_path
+        assert args[args.index('-af') + 1] == audio_generator._FFMPEG_FILTERGRAPH
+        assert args[args.index('-t') + 1] == '2.500'
+        assert args[args.index('-ar') + 1] == '44100' and args[args.index('-ac') + 1] == '1'
+        assert args[-1] == optimized_path
+        print("✅ One ffmpeg call with the loudness filter, duration and output format")
+
+
+def main():
+    """Run every test in this file and print a summary"""
+    tests = [obj for name, obj in globals().items() if name.startswith('test_') and callable(obj)]
+    failed = 0
+    for test in tests:
+        try:
+            test()
+        except Exception as e:
+            failed += 1
+            print(f"❌ {test.__name__} failed: {e!r}")
+
+    print("\n" + "=" * 50)
+    print(f"Passed: {len(tests) - failed}/{len(tests)}")
+    return failed == 0
+
+
+if __name__ == "__main__":
+    success = main()
+    sys.exit(0 if success else 1)
@@ -0,0 +1,404 @@
+#!/usr/bin/env python3
+"""
+Tests for the Claude refinement service
+Runs without API keys: the Anthropic clients are replaced by in-memory fakes
+"""
+
+import asyncio
+import json
+import os
+import sys
+import tempfile
+import time
+from types import SimpleNamespace
+
+# Add project root to Python path
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+
+class FakeStream:
+    """Context manager standing in for Anthropic.messages.stream(...)"""
+
+    def __init__(self, text, stop_reason):
+        self.text_stream = iter([text])
+        self.consumed = 0
+        self._chunks = [text[i:i + 8] for i in range(0, len(text), 8)]
+        self._message = SimpleNamespace(
+            stop_reason=stop_reason,
+            content=[SimpleNamespace(type='text', text=text)]
+        )
+
+    def __enter__(self):
+        return self
+
+    def __iter__(self):
+        for chunk in self._chunks:
+            self.consumed += len(chunk)
+            yield SimpleNamespace(type='text', text=chunk)
+
+    def __exit__(self, *exc_info):
+        return False
+
+    def get_final_message(self):
+        return self._message
+
+
+class FakeMessages:
+    """Answers every stream call with the next (text, stop_reason) pair"""
+
+    def __init__(self, answers):
+        self.answers = list(answers)
+        self.calls = []
+
+    def stream(self, **params):
+        self.calls.append(params)
+        self.last_stream = FakeStream(*self.answers.pop(0))
+        return self.last_stream
+
+
+class FakeAsyncStream:
+    """Async context manager standing in for AsyncAnthropic.messages.stream(...) with a forced tool call"""
+
+    def __init__(self, messages, answer):
+        self.messages = messages
+        self.answer = answer
+
+    async def __aenter__(self):
+        self.messages.in_flight += 1
+        self.messages.max_in_flight = max(self.messages.max_in_flight, self.messages.in_flight)
+        await asyncio.sleep(self.messages.delay)
+        if isinstance(self.answer, Exception):
+            self.messages.in_flight -= 1
+            raise self.answer
+        return self
+
+    async def __aexit__(self, *exc_info):
+        self.messages.in_flight -= 1
+        return False
+
+    async def get_final_message(self):
+        tool_use = SimpleNamespace(type='tool_use', input=json.loads(self.answer))
+        return SimpleNamespace(content=[tool_use], stop_reason='tool_use')
+
+
+class FakeAsyncMessages:
+    """Answers each scene's stream call by the scene description found in its prompt"""
+
+    def __init__(self, answers, delay=0.0):
+        self.answers = answers  # description -> answer text, or an exception to raise
+        self.delay = delay
+        self.calls = []
+        self.in_flight = 0
+        self.max_in_flight = 0
+
+    def stream(self, **params):
+        self.calls.append(params)
+        prompt = params['messages'][0]['content']
+        answer = next(answer for description, answer in self.answers.items() if description in prompt)
+        return FakeAsyncStream(self, answer)
+
+
+def _service(cache_dir, answers):
+    from reels.claude_refinement import ClaudeRefinementService
+    from reels.response_cache import ResponseCache
+
+    service = ClaudeRefinementService()
+    service.claude = SimpleNamespace(messages=FakeMessages(answers))
+    service.response_cache = ResponseCache(cache_dir)
+    service.response_cache.enabled = True
+    return service
+
+
+def _refinement_service(answers, max_concurrency=8, delay=0.0):
+    from reels.claude_refinement import ClaudeRefinementService
+
+    service = ClaudeRefinementService(max_concurrency=max_concurrency)
+    service.claude = SimpleNamespace()  # only checked for availability before scenes fan out
+    service.async_claude = SimpleNamespace(messages=FakeAsyncMessages(answers, delay))
+    service.response_cache.enabled = False  # every run must reach the fake client
+    return service
+
+
+def _scene_answer(prompt, quality, model, analysis, improvements):
+    return json.dumps({
+        'enhanced_prompt': prompt,
+        'quality_prediction': quality,
+        'recommended_model': model,
+        'technical_params': {'resolution': '1080x1920'},
+        'analysis': analysis,
+        'improvements': improvements
+    })
+
+
+def test_scene_refinements_aggregate():
+    """Per-scene answers keep scene order, a failed scene falls back alone, repeated advice appears once"""
+    print("🧪 Testing per-scene Claude refinement...")
+
+    scenes = [
+        {'scene_number': 1, 'description': 'Sunrise over the city'},
+        {'scene_number': 2, 'description': 'Runner crossing the bridge'},
+        {'scene_number': 3, 'description': 'Coffee at the finish line'}
+    ]
+    service = _refinement_service({
+        'Sunrise over the city': _scene_answer(
+            'Sunrise over the city, 9:16', 0.9, 'runway-gen3', 'Strong opening light',
+            ['Add a slow push-in', 'Keep text out of the top third']
+        ),
+        'Runner crossing the bridge': RuntimeError('overloaded'),
+        'Coffee at the finish line': _scene_answer(
+            'Coffee at the finish line, 9:16', 0.7, 'runway-gen3', 'Strong opening light',
+            ['Add a slow push-in']
+        )
+    })
+
+    result = service.refine_video_prompts({'storyboard': {'scenes': scenes}}, {'platform': 'instagram'})
+
+    assert result['status'] == 'success'
+    prompts = result['refined_prompts']
+    assert [p['scene_number'] for p in prompts] == [1, 2, 3]
+    assert prompts[0]['enhanced_prompt'] == 'Sunrise over the city, 9:16'
+    assert prompts[1]['enhanced_prompt'].startswith('High-quality cinematic Runner crossing the bridge')
+    assert prompts[2]['original_description'] == 'Coffee at the finish line'
+    assert not any({'analysis', 'improvements'} & p.keys() for p in prompts)
+
+    assert result['quality_predictions']['overall_score'] == round((0.9 + 0.75 + 0.7) / 3, 3)
+    assert result['model_optimizations']['primary_model'] == 'runway-gen3'
+    assert result['model_optimizations']['fallback_models'] == ['hailuo-02']
+    assert result['improvement_suggestions'] == ['Add a slow push-in', 'Keep text out of the top third']
+    assert result['claude_analysis'] == 'Strong opening light'
+    print("✅ Scenes refined in order with a per-scene fallback and deduplicated advice")
+
+
+def test_scene_refinements_are_bounded():
+    """No more than max_concurrency scene calls are in flight at once"""
+    print("\n🧪 Testing scene refinement concurrency bound...")
+
+    scenes = [{'scene_number': n, 'description': f'Scene {n} shot'} for n in range(1, 6)]
+    answers = {
+        scene['description']: _scene_answer(f"{scene['description']}, 9:16", 0.8, 'hailuo-02', '', [])
+        for scene in scenes
+    }
+    service = _refinement_service(answers, max_concurrency=2, delay=0.05)
+
+    result = service.refine_video_prompts({'storyboard': {'scenes': scenes}}, {})
+
+    messages = service.async_claude.messages
+    assert len(messages.calls) == 5
+    assert messages.max_in_flight == 2, f"Expected 2 concurrent calls, saw {messages.max_in_flight}"
+    assert [p['enhanced_prompt'] for p in result['refined_prompts']] == [f'Scene {n} shot, 9:16' for n in range(1, 6)]
+    print("✅ Scene calls overlap up to the concurrency limit")
+
+
+def test_truncated_answer_not_cached():
+    """An answer still cut off after the doubled budget is returned but never cached"""
+    print("\n🧪 Testing that truncated Claude answers are not cached...")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        service = _service(tmp, [('- partial', 'max_tokens'), ('- still partial', 'max_tokens')])
+        text = service._stream_text(service.IMPROVE_MODEL, 'system', 'prompt', max_tokens=100, temperature=0.4)
+
+        assert text == '- still partial'
+        assert [call['max_tokens'] for call in service.claude.messages.calls] == [100, 200]
+        assert not os.listdir(tmp), "Truncated answer was cached"
+        print("✅ Truncated answer skipped the response cache")
+
+
+def test_complete_answer_cached():
+    """A complete answer is cached and served on the next identical request"""
+    print("\n🧪 Testing that complete Claude answers are cached...")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        service = _service(tmp, [('- Tighten pacing', 'end_turn')])
+        first = service._stream_text(service.IMPROVE_MODEL, 'system', 'prompt', max_tokens=100, temperature=0.4)
+        second = service._stream_text(service.IMPROVE_MODEL, 'system', 'prompt', max_tokens=100, temperature=0.4)
+
+        assert first == second == '- Tighten pacing'
+        assert len(service.claude.messages.calls) == 1, "Second request should be a cache hit"
+        print("✅ Complete answer served from the response cache")
+
+
+def test_prompt_bytes_ignore_debug_mode():
+    """REELS_DEBUG must not change the prompt text (and so the response cache key)"""
+    print("\n🧪 Testing prompt serialization under REELS_DEBUG...")
+
+    from reels.claude_refinement import ClaudeRefinementService
+
+    service = ClaudeRefinementService()
+    quality_report = {'overall_score': 0.6, 'recommendations': ['Brighter colors']}
+    storyboard = {'storyboard': {'scenes': [{'scene_number': 1, 'description': 'Café at dawn'}]}}
+
+    previous = os.environ.pop('REELS_DEBUG', None)
+    try:
+        normal = service._build_improvement_prompt(quality_report, storyboard)
+        os.environ['REELS_DEBUG'] = '1'
+        debug = service._build_improvement_prompt(quality_report, storyboard)
+    finally:
+        os.environ.pop('REELS_DEBUG', None)
+        if previous is not None:
+            os.environ['REELS_DEBUG'] = previous
+
+    assert normal == debug, "Prompt changed with REELS_DEBUG"
+    assert '\n  ' not in normal, "Prompt JSON should be compact"
+    print("✅ Prompt text is identical in debug mode")
+
+
+ASSESSMENT = (
+    '{"technical_quality": %s, "content_quality": 0.9, "brand_alignment": 0.9, '
+    '"platform_optimization": 0.9, "engagement_potential": 0.9, "overall_score": %s, '
+    '"analysis": "Strong hook and pacing throughout the reel", "recommendations": ["Add captions"]}'
+)
+
+
+def test_assessment_early_exit_is_flagged():
+    """A clear pass stops streaming after the scores and says so in the result"""
+    print("\n🧪 Testing quality assessment early exit...")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        answer = ASSESSMENT % (0.95, 0.93)
+        service = _service(tmp, [(answer, 'end_turn')])
+        result = service.assess_content_quality({'platform': 'instagram'})
+
+        assert result['early_exit'] is True
+        assert result['overall_score'] == 0.93 and result['pass_threshold']
+        assert result['recommendations'] == []
+        assert 'skipped' in result['detailed_analysis']
+        assert service.claude.messages.last_stream.consumed < len(answer), "Stream should stop after the scores"
+        print("✅ Early exit is flagged and skips the analysis")
+
+
+def test_assessment_below_threshold_streams_everything():
+    """Below the early-exit threshold the full analysis and recommendations are kept"""
+    print("\n🧪 Testing quality assessment without early exit...")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        service = _service(tmp, [(ASSESSMENT % (0.8, 0.8), 'end_turn')])
+        result = service.assess_content_quality({'platform': 'instagram'})
+
+        assert result['early_exit'] is False
+        assert result['recommendations'] == ['Add captions']
+        assert result['detailed_analysis'] == 'Strong hook and pacing throughout the reel'
+        print("✅ Full assessment kept below the threshold")
+
+
+def test_extract_json_object():
+    """JSON answers are found inside fences and around prose containing braces"""
+    print("\n🧪 Testing JSON extraction from Claude answers...")
+
+    from reels.claude_refinement import _extract_json_object
+
+    fenced = 'Here is the result:\n```json\n{"enhanced_prompt": "Sunrise {golden}", "scores": {"a": 1}}\n```'
+    assert _extract_json_object(fenced) == {'enhanced_prompt': 'Sunrise {golden}', 'scores': {'a': 1}}
+
+    # Trailing prose with a brace must not make the first object unreadable
+    trailing = '{"overall_score": 0.8} Let me know if you want {more} detail.'
+    assert _extract_json_object(trailing) == {'overall_score': 0.8}
+
+    # Two objects: the first complete one wins instead of a greedy span over both
+    assert _extract_json_object('{"a": 1}\n{"b": 2}') == {'a': 1}
+    assert _extract_json_object('{not json} then {"c": [1, 2]}') == {'c': [1, 2]}
+    assert _extract_json_object('No JSON here') is None
+    assert _extract_json_object('[1, 2, 3]') is None
+    print("✅ JSON objects extracted from fenced and trailing-text answers")
+
+
+def test_response_cache_expiry_and_eviction():
+    """Expired answers miss, and past max_entries the least recently used go first"""
+    print("\n🧪 Testing the Claude response cache...")
+
+    from reels.response_cache import ResponseCache, response_cache_key
+
+    with tempfile.TemporaryDirectory() as tmp:
+        cache = ResponseCache(tmp, ttl=60, max_entries=2)
+        cache.enabled = True
+
+        key = response_cache_key({'model': 'm', 'messages': [{'role': 'user', 'content': 'hi'}]})
+        assert key == response_cache_key({'messages': [{'role': 'user', 'content': 'hi'}], 'model': 'm'})
+        cache.set(key, 'answer')
+        assert cache.get(key) == 'answer'
+
+        past = time.time() - 120
+        os.utime(os.path.join(tmp, f'{key}.txt'), (past, past))
+        assert cache.get(key) is None, "Expired answer should miss"
+
+        now = time.time()
+        for age, name in ((30, 'a'), (20, 'b')):
+            cache.set(name, name)
+            os.utime(os.path.join(tmp, f'{name}.txt'), (now - age, now - age))
+        assert cache.get('a') == 'a'  # 'b' is now the least recently used
+        cache.set('c', 'c')
+
+        assert sorted(os.listdir(tmp)) == ['a.txt', 'c.txt']
+        print("✅ Response cache expires and evicts least recently used answers")
+
+
+def test_token_bucket_paces_requests():
+    """Bursts up to capacity pass at once, the rest wait for refill at the set rate"""
+    print("\n🧪 Testing AsyncTokenBucket pacing...")
+
+    from reels.async_runtime import AsyncTokenBucket
+
+    async def acquire_all():
+        bucket = AsyncTokenBucket(rate_per_sec=20, capacity=2)
+        start = time.monotonic()
+        times = []
+        for _ in range(4):
+            await bucket.acquire()
+            times.append(time.monotonic() - start)
+        # A cost above capacity is clamped instead of waiting forever
+        await bucket.acquire(cost=10)
+        times.append(time.monotonic() - start)
+        return times
+
+    times = asyncio.run(acquire_all())
+    assert times[1] < 0.03, f"Burst should not wait: {times}"
+    assert 0.08 <= times[3] < 0.5, f"Third and fourth tokens refill at 20/s: {times}"
+    assert times[4] - times[3] >= 0.08, f"Clamped cost waits for a full bucket: {times}"
+    print("✅ Token bucket allows the burst, then paces to the refill rate")
+
+
+def test_refinement_result_keeps_baseline_schema():
+    """Per-scene answers aggregate into the full quality_predictions and model_optimizations"""
+    print("\n🧪 Testing the refinement result schema...")
+
+    from reels.claude_refinement import ClaudeRefinementService
+
+    service = ClaudeRefinementService()
+    scenes = [{'scene_number': 1, 'description': 'Sunrise'}, {'scene_number': 2, 'description': 'City'}]
+    scene_results = [
+        {
+            'scene_number': 1, 'enhanced_prompt': 'Sunrise, 9:16', 'quality_prediction': 0.9,
+            'recommended_model': 'hailuo-02', 'technical_params': {}, 'technical_feasibility': 0.8,
+            'creative_appeal': 0.7, 'engagement_potential': 0.6, 'model_tip': 'Keep camera moves slow'
+        },
+        RuntimeError('scene failed')
+    ]
+    result = service._build_refinement_result({}, scenes, scene_results, {})
+
+    predictions = result['quality_predictions']
+    assert set(predictions) == {'overall_score', 'technical_feasibility', 'creative_appeal', 'engagement_potential'}
+    assert predictions['technical_feasibility'] == 0.8
+    assert set(result['model_optimizations']) == {'primary_model', 'fallback_models', 'model_specific_tips'}
+    assert result['model_optimizations']['model_specific_tips'] == ['Keep camera moves slow']
+    assert 'model_tip' not in result['refined_prompts'][0]
+    print("✅ Baseline quality_predictions and model_optimizations keys are kept")
+
+
+def main():
+    """Run every test in this file and print a summary"""
+    tests = [obj for name, obj in globals().items() if name.startswith('test_') and callable(obj)]
+    failed = 0
+    for test in tests:
+        try:
+            test()
+        except Exception as e:
+            failed += 1
+            print(f"❌ {test.__name__} failed: {e!r}")
+
+    print("\n" + "=" * 50)
+    print(f"Passed: {len(tests) - failed}/{len(tests)}")
+    return failed == 0
+
+
+if __name__ == "__main__":
+    success = main()
+    sys.exit(0 if success else 1)